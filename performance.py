@@ -1,14 +1,156 @@
+import argparse
+import subprocess
+import sys
+import tracemalloc
 from timeit import timeit
-from tests.conftest import puzzle_3x3_simple
-from sudoku import SudokuSolver
+from typing import Callable
+
+from attrs import frozen
+
+from tests.conftest import puzzle_3x3_hard, puzzle_3x3_simple
+from sudoku import SudokuPuzzle, SudokuSolver
+from sudoku.grader import grade
+from sudoku.propagation import Propagator
+from sudoku.solver import solve_simple_board
 import logging
 
 logging.basicConfig(level=logging.WARNING)
 
 S_TO_MS = 1000
+B_TO_KB = 1 / 1024
+
+
+@frozen
+class MemoryReport:
+    name: str
+    peak_bytes: int
+    retained_blocks: int
+    retained_bytes: int
+
+
+def measure_memory(name: str, func: Callable[[], object], warmup: bool = True) -> MemoryReport:
+    """
+    peak traced memory during func, and the blocks and bytes it still holds once its return
+    value is dropped. func is called once beforehand so that one-off caches are not counted
+    """
+    if warmup:
+        func()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        start_bytes = tracemalloc.get_traced_memory()[0]
+        result = func()
+        peak_bytes = tracemalloc.get_traced_memory()[1] - start_bytes
+        # drop the return value first so that only memory func kept hold of counts as retained
+        del result
+        after = tracemalloc.take_snapshot()
+    finally:
+        tracemalloc.stop()
+
+    stats = after.compare_to(before, 'filename')
+    return MemoryReport(name, peak_bytes, sum(s.count_diff for s in stats), sum(s.size_diff for s in stats))
+
+
+def _hidden_values_of_all_groups(puzzle: SudokuPuzzle):
+    return [puzzle.get_single_hidden_values_of_group(g) for g in puzzle.rows + puzzle.cols + puzzle.squares]
+
+
+def _solver_step(puzzle, step: str) -> Callable[[], object]:
+    return lambda: getattr(SudokuSolver(puzzle), step)()
+
+
+MEMORY_PROFILES: dict[str, Callable[[], object]] = {
+    'solve_simple': lambda: SudokuSolver(puzzle_3x3_simple).solve(),
+    'solve_hard': lambda: SudokuSolver(puzzle_3x3_hard).solve(),
+    'propagate': lambda: Propagator.from_board(puzzle_3x3_simple).propagate(),
+    'grade': lambda: grade(puzzle_3x3_hard),
+    'solve_simple_board': lambda: solve_simple_board(SudokuPuzzle(puzzle_3x3_simple)),
+    'get_single_hidden_values_of_group': lambda: _hidden_values_of_all_groups(SudokuPuzzle(puzzle_3x3_simple)),
+    'solve_groups_with_one_missing': _solver_step(puzzle_3x3_simple, 'solve_groups_with_one_missing'),
+    'solve_hidden_values_single': _solver_step(puzzle_3x3_simple, 'solve_hidden_values_single'),
+    'solve_cells_with_one_possibility': _solver_step(puzzle_3x3_simple, 'solve_cells_with_one_possibility'),
+}
+
+
+def check_budgets(reports: list[MemoryReport], budgets: dict[str, int]) -> list[str]:
+    """messages for every report whose peak is over its budget in bytes"""
+    return [f'{r.name}: peak {r.peak_bytes} bytes is over the budget of {budgets[r.name]} bytes'
+            for r in reports if r.name in budgets and r.peak_bytes > budgets[r.name]]
+
+
+def parse_budget(text: str) -> tuple[str, int]:
+    name, _, limit = text.partition('=')
+    if name not in MEMORY_PROFILES or not limit.isdigit():
+        raise argparse.ArgumentTypeError(f'expected NAME=BYTES with NAME one of {list(MEMORY_PROFILES)}')
+    return name, int(limit)
+
+
+def profile_memory(budgets: dict[str, int]) -> int:
+    reports = [measure_memory(name, func) for name, func in MEMORY_PROFILES.items()]
+    for r in reports:
+        print(f'{r.name:>35}: peak={r.peak_bytes * B_TO_KB:.1f}KB '
+              f'retained={r.retained_bytes * B_TO_KB:.1f}KB in {r.retained_blocks} blocks')
+
+    violations = check_budgets(reports, budgets)
+    for v in violations:
+        print(f'over budget: {v}', file=sys.stderr)
+    return 1 if violations else 0
+
+
+IMPORT_MODULES = ('sudoku', 'sudoku.puzzle', 'sudoku.solver', 'sudoku.__main__')
+US_TO_MS = 1 / 1000
+
+
+def measure_import_time(module: str, repeat: int = 5) -> float:
+    """fastest cumulative import time of module in milliseconds, each in a fresh interpreter"""
+    times = []
+    for _ in range(repeat):
+        result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                                capture_output=True, text=True, check=True)
+        for line in result.stderr.splitlines():
+            _, cumulative, name = line.split('|')
+            if name.strip() == module:
+                times.append(int(cumulative) * US_TO_MS)
+    return min(times)
+
+
+def parse_import_budget(text: str) -> tuple[str, float]:
+    module, _, limit = text.partition('=')
+    try:
+        return module, float(limit)
+    except ValueError:
+        raise argparse.ArgumentTypeError('expected MODULE=MILLISECONDS')
+
+
+def profile_imports(budgets: dict[str, float]) -> int:
+    exit_code = 0
+    for module in dict.fromkeys(IMPORT_MODULES + tuple(budgets)):
+        import_ms = measure_import_time(module)
+        print(f'{module:>20}: {import_ms:.1f}ms')
+        if module in budgets and import_ms > budgets[module]:
+            print(f'over budget: {module} imports in {import_ms:.1f}ms, budget is {budgets[module]}ms',
+                  file=sys.stderr)
+            exit_code = 1
+    return exit_code
 
 
 def main():
+    parser = argparse.ArgumentParser(description='sudoku solver benchmarks')
+    parser.add_argument('--memory', action='store_true', help='report peak memory with tracemalloc')
+    parser.add_argument('--budget', type=parse_budget, action='append', default=[], metavar='NAME=BYTES',
+                        help='fail if the peak memory of NAME is over BYTES. implies --memory')
+    parser.add_argument('--imports', action='store_true', help='report import times with python -X importtime')
+    parser.add_argument('--import-budget', type=parse_import_budget, action='append', default=[],
+                        metavar='MODULE=MS', help='fail if MODULE takes over MS to import. implies --imports')
+    args = parser.parse_args()
+
+    if args.imports or args.import_budget:
+        sys.exit(profile_imports(dict(args.import_budget)))
+
+    if args.memory or args.budget:
+        sys.exit(profile_memory(dict(args.budget)))
+
     n = 10
 
     performance_simple_puzzle = (timeit(lambda: SudokuSolver(puzzle_3x3_simple).solve(), number=n) / n) * S_TO_MS
@@ -16,4 +158,4 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
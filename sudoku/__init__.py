@@ -1,3 +1,42 @@
-from .groups import RowArray, ColArray, SquareArray
-from .puzzle import SudokuPuzzle
-from .solver import SudokuSolver
+"""
+submodules and the names below are imported on first use (PEP 562), so that importing the
+package does not load numpy or the solver until they are needed
+"""
+from importlib import import_module
+
+# type checkers treat this as typing.TYPE_CHECKING without the cost of importing typing
+TYPE_CHECKING = False
+
+_EXPORTS = {
+    'RowArray': 'sudoku.groups',
+    'ColArray': 'sudoku.groups',
+    'SquareArray': 'sudoku.groups',
+    'SudokuPuzzle': 'sudoku.puzzle',
+    'SudokuSolver': 'sudoku.solver',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name in _EXPORTS:
+        value = getattr(import_module(_EXPORTS[name]), name)
+    else:
+        try:
+            value = import_module(f'{__name__}.{name}')
+        except ModuleNotFoundError as e:
+            if e.name != f'{__name__}.{name}':
+                raise
+            raise AttributeError(f'module {__name__!r} has no attribute {name!r}') from None
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .groups import RowArray, ColArray, SquareArray
+    from .puzzle import SudokuPuzzle
+    from .solver import SudokuSolver
@@ -0,0 +1,60 @@
+"""
+command line entry point: python -m sudoku solve PUZZLE
+
+the solver is only imported once the arguments are parsed, so --help and argument errors
+return without loading numpy
+"""
+import argparse
+import sys
+
+VARIANTS = ('classic', 'diagonal', 'windoku')
+
+
+def solve(args: argparse.Namespace) -> int:
+    from sudoku import geometry
+    from sudoku.puzzle import PuzzleException, SudokuPuzzle
+    from sudoku.solver import SudokuSolver
+
+    exit_code = 0
+    for text in args.puzzles or sys.stdin:
+        if not text.strip():
+            continue
+        try:
+            puzzle = SudokuPuzzle.from_string(text)
+            if args.variant != 'classic':
+                puzzle.geometry = getattr(geometry, f'{args.variant}_geometry')(puzzle.size)
+            solver = SudokuSolver(puzzle, timeout=args.timeout).solve()
+        except (PuzzleException, ValueError) as e:
+            print(f'{type(e).__name__}: {e}', file=sys.stderr)
+            exit_code = 1
+            continue
+        if not solver.is_solved:
+            print('-')
+            exit_code = 1
+        elif args.grid:
+            print('\n'.join(' '.join(str(v) for v in row) for row in solver.puzzle.board.tolist()) + '\n')
+        else:
+            print(solver.puzzle.to_string())
+    return exit_code
+
+
+def make_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m sudoku', description='sudoku solver')
+    commands = parser.add_subparsers(dest='command', required=True)
+    solve_parser = commands.add_parser('solve', help='solve puzzles given as strings of cell values')
+    solve_parser.add_argument('puzzles', nargs='*', metavar='PUZZLE',
+                              help="one character per cell, '0' or '.' for empty cells. read from stdin if omitted")
+    solve_parser.add_argument('--timeout', type=float, default=10, help='seconds to spend on each puzzle')
+    solve_parser.add_argument('--variant', choices=VARIANTS, default='classic')
+    solve_parser.add_argument('--grid', action='store_true', help='print the solution as a grid')
+    solve_parser.set_defaults(func=solve)
+    return parser
+
+
+def main(argv: list[str] = None) -> int:
+    args = make_parser().parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
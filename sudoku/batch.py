@@ -0,0 +1,188 @@
+import json
+import logging
+import os
+from itertools import islice
+from pathlib import Path
+from typing import Iterator
+
+from attrs import define, field
+from numpy.typing import NDArray
+
+from sudoku.puzzle import PuzzleException, SudokuPuzzle
+from sudoku.solver import SudokuSolver
+from sudoku.store import SolutionStore
+from sudoku.validators import validate_boards
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILE = 'manifest.json'
+FAILURES_FILE = 'failures.tsv'
+
+
+class BatchException(Exception):
+    pass
+
+
+def write_atomic(path: Path, text: str):
+    """write to a temporary file next to path, then rename it over path"""
+    tmp_path = path.with_name(f'.{path.name}.tmp')
+    with open(tmp_path, 'w') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def iter_puzzle_lines(path: Path) -> Iterator[str]:
+    with open(path) as f:
+        for line in f:
+            line = ''.join(line.split())
+            if line and not line.startswith('#'):
+                yield line
+
+
+def solve_line(line: str, timeout: float) -> tuple[str | None, str | None]:
+    """
+    Returns:
+        the solution string, or None and the reason the puzzle failed
+    """
+    try:
+        solver = SudokuSolver(SudokuPuzzle.from_string(line), timeout=timeout).solve()
+    except (PuzzleException, ValueError) as e:
+        return None, f'{type(e).__name__}: {e}'
+    if not solver.is_solved:
+        return None, 'timeout'
+    return solver.puzzle.to_string(), None
+
+
+def validate_lines(lines: list[str]) -> tuple[dict[int, NDArray[int]], list[str | None]]:
+    """
+    parse each puzzle line once and validate the boards together in one batch
+
+    Returns:
+        the valid boards by line index, and the reason each line is invalid or None
+    """
+    reasons = [None] * len(lines)
+    boards = {}
+    for i, line in enumerate(lines):
+        try:
+            boards[i] = SudokuPuzzle.from_string(line).board
+        except (PuzzleException, ValueError) as e:
+            reasons[i] = f'{type(e).__name__}: {e}'
+
+    validation = validate_boards(list(boards.values()))
+    for i, shape_ok, values_ok, conflicts in zip(boards, validation.valid_shape, validation.valid_values,
+                                                 validation.unit_conflicts):
+        if not shape_ok:
+            reasons[i] = 'invalid board size'
+        elif not values_ok:
+            reasons[i] = 'value out of range'
+        elif conflicts.any():
+            reasons[i] = 'value repeated in a unit'
+    return {i: board for i, board in boards.items() if reasons[i] is None}, reasons
+
+
+def lookup_boards(store: SolutionStore, boards: dict[int, NDArray[int]]) -> dict[int, str]:
+    """solutions already in the store, by the same keys as boards"""
+    solutions = zip(boards, store.get_many(list(boards.values())))
+    return {i: SudokuPuzzle(solution).to_string() for i, solution in solutions if solution is not None}
+
+
+@define
+class BatchJob:
+    """
+    solve a file of puzzles (one per line) in fixed size chunks. each chunk's results and the
+    progress manifest are written atomically, so a restarted job resumes after the last
+    completed chunk. failed puzzles are appended to a side file instead of stopping the job.
+    puzzles found in the optional solution store are not solved again
+    """
+    input_path: Path = field(converter=Path)
+    output_dir: Path = field(converter=Path)
+    chunk_size: int = 1000
+    timeout: float = 10
+    store_path: Path | None = field(default=None, converter=lambda p: None if p is None else Path(p))
+
+    @property
+    def manifest_path(self) -> Path:
+        return self.output_dir / MANIFEST_FILE
+
+    @property
+    def failures_path(self) -> Path:
+        return self.output_dir / FAILURES_FILE
+
+    def chunk_path(self, chunk: int) -> Path:
+        return self.output_dir / f'chunk-{chunk:06d}.txt'
+
+    def read_manifest(self) -> dict:
+        if not self.manifest_path.exists():
+            return {'input': str(self.input_path), 'chunk_size': self.chunk_size,
+                    'completed_chunks': 0, 'solved': 0, 'failed': 0, 'failures_size': 0}
+        manifest = json.loads(self.manifest_path.read_text())
+        if manifest['chunk_size'] != self.chunk_size:
+            raise BatchException(f'job was started with chunk_size={manifest["chunk_size"]}')
+        return manifest
+
+    def iter_chunks(self, start: int = 0) -> Iterator[list[str]]:
+        lines = iter_puzzle_lines(self.input_path)
+        for _ in islice(lines, start * self.chunk_size):
+            pass
+        while chunk := list(islice(lines, self.chunk_size)):
+            yield chunk
+
+    def run(self, max_chunks: int = None) -> dict:
+        self.output_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self.read_manifest()
+        start = manifest['completed_chunks']
+
+        # drop failures written by a chunk that did not complete
+        with open(self.failures_path, 'a') as failures:
+            failures.truncate(manifest['failures_size'])
+
+        store = None if self.store_path is None else SolutionStore(self.store_path)
+        try:
+            for chunk_num, chunk in enumerate(islice(self.iter_chunks(start), max_chunks), start):
+                self._run_chunk(chunk_num, chunk, manifest, store)
+        finally:
+            if store is not None:
+                store.close()
+        return manifest
+
+    def _run_chunk(self, chunk_num: int, chunk: list[str], manifest: dict, store: SolutionStore | None):
+        boards, reasons = validate_lines(chunk)
+        cached = {} if store is None else lookup_boards(store, boards)
+        results = []
+        failures = []
+        new_solutions = []
+        for i, line in enumerate(chunk):
+            solution, reason = cached.get(i), reasons[i]
+            if solution is None:
+                if reason is None:
+                    solution, reason = solve_line(line, self.timeout)
+                if solution is None:
+                    failures.append(f'{chunk_num * self.chunk_size + i}\t{line}\t{reason}\n')
+                else:
+                    new_solutions.append((i, solution))
+            results.append(f'{line} {solution or "-"}\n')
+
+        if store is not None and new_solutions:
+            store.put_many((boards[i], SudokuPuzzle.from_string(s).board) for i, s in new_solutions)
+
+        write_atomic(self.chunk_path(chunk_num), ''.join(results))
+        with open(self.failures_path, 'a') as f:
+            f.writelines(failures)
+            f.flush()
+            os.fsync(f.fileno())
+
+        manifest['completed_chunks'] = chunk_num + 1
+        manifest['solved'] += len(chunk) - len(failures)
+        manifest['failed'] += len(failures)
+        manifest['failures_size'] = self.failures_path.stat().st_size
+        write_atomic(self.manifest_path, json.dumps(manifest, indent=2))
+        logger.info(f'completed chunk {chunk_num}: {len(chunk) - len(failures)} solved, {len(failures)} failed')
+
+    def iter_results(self) -> Iterator[tuple[str, str | None]]:
+        for chunk in range(self.read_manifest()['completed_chunks']):
+            with open(self.chunk_path(chunk)) as f:
+                for line in f:
+                    puzzle, solution = line.split()
+                    yield puzzle, None if solution == '-' else solution
@@ -0,0 +1,49 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from sudoku.geometry import Geometry
+
+
+class CandidateException(Exception):
+    pass
+
+
+def make_candidates(board: NDArray[int], geometry: Geometry, out: NDArray[bool] = None) -> NDArray[bool]:
+    """
+    candidate tensor of shape (num_cells, size). filled cells have no candidates. a stack of
+    boards of shape (N, num_cells) gives candidates of shape (N, num_cells, size). written to
+    out if given
+    """
+    size = geometry.size
+    present = np.zeros(board.shape[:-1] + (geometry.num_units, size + 1), dtype=np.uint8)
+    np.put_along_axis(present, board[..., geometry.units], 1, axis=-1)
+    blocked = (geometry.membership.astype(np.uint8) @ present[..., 1:]) > 0
+    candidates = np.logical_not(blocked, out=out)
+    candidates[board != 0] = False
+    return candidates
+
+
+def find_hidden_singles(candidates: NDArray[bool], geometry: Geometry,
+                        units: NDArray[int] = None) -> tuple[NDArray[int], NDArray[int]]:
+    """
+    find every value that has exactly one possible cell in a unit
+
+    Args:
+        candidates: candidate tensor of shape (num_cells, size)
+        geometry: the units of the board
+        units: indices of the units to search. defaults to all of them
+
+    Returns:
+        flat cell indices and the values to place in them
+    """
+    unit_cells = geometry.units if units is None else geometry.units[units]
+    unit_candidates = candidates[unit_cells]  # (units, cells, values)
+    unit_idx, value_idx = np.nonzero(unit_candidates.sum(axis=1) == 1)
+    positions = unit_candidates[unit_idx, :, value_idx].argmax(axis=1)
+    cells = unit_cells[unit_idx, positions]
+
+    keys = np.unique(cells * geometry.size + value_idx)
+    cells, value_idx = np.divmod(keys, geometry.size)
+    if np.unique(cells).size != cells.size:
+        raise CandidateException('cell is the only place for more than one value')
+    return cells, value_idx + 1
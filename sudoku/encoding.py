@@ -0,0 +1,91 @@
+import numpy as np
+from numpy.typing import NDArray
+
+from sudoku.validators import is_valid_board_size
+
+FNV_OFFSET = np.uint64(0xcbf29ce484222325)
+FNV_PRIME = np.uint64(0x100000001b3)
+
+
+class EncodingException(Exception):
+    pass
+
+
+def bits_per_cell(size: int) -> int:
+    """bits needed for the values 0 to size. 4 for a 9x9 board"""
+    return int(size).bit_length()
+
+
+def packed_length(size: int) -> int:
+    return -(-size * size * bits_per_cell(size) // 8)
+
+
+def size_from_packed_length(length: int, max_size: int = 64) -> int:
+    for side in range(2, int(np.sqrt(max_size)) + 1):
+        if packed_length(side * side) == length:
+            return side * side
+    raise EncodingException(f'no board size packs into {length} bytes')
+
+
+def pack_boards(boards: NDArray[int]) -> NDArray[np.uint8]:
+    """
+    pack a batch of boards of shape (N, size, size) into an array of shape (N, packed_length(size)).
+    each cell uses bits_per_cell(size) bits, most significant bit first, in row order
+
+    Raises:
+        EncodingException: if the size is invalid or a value is outside 0 to size
+    """
+    boards = np.asarray(boards)
+    size = boards.shape[-1]
+    if not is_valid_board_size(size):
+        raise EncodingException(f'Invalid puzzle size: {size}')
+    if not ((boards >= 0) & (boards <= size)).all():
+        raise EncodingException(f'board values must be from 0 to {size}')
+    bits = bits_per_cell(size)
+    values = boards.reshape(len(boards), size * size).astype(np.uint8)
+    if bits == 4:
+        # two cells per byte without going through individual bits
+        if values.shape[1] % 2:
+            values = np.pad(values, ((0, 0), (0, 1)))
+        return (values[:, 0::2] << 4) | values[:, 1::2]
+    shifts = np.arange(bits - 1, -1, -1, dtype=np.uint8)
+    cell_bits = (values[:, :, None] >> shifts) & 1
+    return np.packbits(cell_bits.reshape(len(boards), -1), axis=1)
+
+
+def unpack_boards(packed: NDArray[np.uint8], size: int = None) -> NDArray[int]:
+    packed = np.asarray(packed, dtype=np.uint8)
+    if size is None:
+        size = size_from_packed_length(packed.shape[-1])
+    bits = bits_per_cell(size)
+    cells = size * size
+    if bits == 4:
+        values = np.empty((len(packed), packed.shape[1] * 2), dtype=np.uint8)
+        values[:, 0::2] = packed >> 4
+        values[:, 1::2] = packed & 0xF
+        return values[:, :cells].astype(int).reshape(len(packed), size, size)
+    cell_bits = np.unpackbits(packed, axis=1, count=cells * bits).reshape(len(packed), cells, bits)
+    weights = 1 << np.arange(bits - 1, -1, -1)
+    return (cell_bits @ weights).reshape(len(packed), size, size)
+
+
+def pack_board(board: NDArray[int]) -> bytes:
+    return pack_boards(np.asarray(board)[None])[0].tobytes()
+
+
+def unpack_board(data: bytes, size: int = None) -> NDArray[int]:
+    return unpack_boards(np.frombuffer(data, dtype=np.uint8)[None], size)[0]
+
+
+def hash_packed(packed: NDArray[np.uint8]) -> NDArray[np.uint64]:
+    """64 bit FNV-1a hash of each packed board, computed a byte column at a time across the batch"""
+    packed = np.asarray(packed, dtype=np.uint8)
+    hashes = np.full(len(packed), FNV_OFFSET, dtype=np.uint64)
+    for column in packed.T:
+        hashes ^= column
+        hashes *= FNV_PRIME
+    return hashes
+
+
+def hash_boards(boards: NDArray[int]) -> NDArray[np.uint64]:
+    return hash_packed(pack_boards(boards))
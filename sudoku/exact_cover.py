@@ -0,0 +1,85 @@
+from typing import Hashable
+
+import numpy as np
+from numpy.typing import NDArray
+
+from sudoku.propagation import Propagator
+
+Choice = tuple[int, int]  # (cell, value)
+Constraint = tuple[str, int, int]
+
+
+def make_exact_cover(propagator: Propagator) -> tuple[dict[Constraint, set[Choice]], dict[Choice, list[Constraint]]]:
+    """
+    the empty cells of the board as an exact cover problem: every cell holds one value and
+    every value appears once per unit
+
+    Returns:
+        the choices that satisfy each constraint and the constraints satisfied by each choice
+    """
+    geometry = propagator.geometry
+    choices: dict[Choice, list[Constraint]] = {}
+    for cell in np.flatnonzero(propagator.board == 0).tolist():
+        for value in (np.flatnonzero(propagator.candidates[cell]) + 1).tolist():
+            choices[(cell, value)] = [('cell', cell, 0)] + [('unit', u, value) for u in geometry.cell_units[cell].tolist()]
+
+    constraints: dict[Constraint, set[Choice]] = {}
+    for choice, satisfied in choices.items():
+        for constraint in satisfied:
+            constraints.setdefault(constraint, set()).add(choice)
+    return constraints, choices
+
+
+def _select(constraints: dict, choices: dict, choice: Hashable) -> list[set]:
+    removed = []
+    for constraint in choices[choice]:
+        for other in constraints[constraint]:
+            for other_constraint in choices[other]:
+                if other_constraint != constraint:
+                    constraints[other_constraint].remove(other)
+        removed.append(constraints.pop(constraint))
+    return removed
+
+
+def _deselect(constraints: dict, choices: dict, choice: Hashable, removed: list[set]):
+    for constraint in reversed(choices[choice]):
+        constraints[constraint] = removed.pop()
+        for other in constraints[constraint]:
+            for other_constraint in choices[other]:
+                if other_constraint != constraint:
+                    constraints[other_constraint].add(other)
+
+
+def algorithm_x(constraints: dict, choices: dict, partial: list) -> list | None:
+    """knuth's algorithm x on dicts of sets"""
+    if not constraints:
+        return partial
+    constraint = min(constraints, key=lambda c: len(constraints[c]))
+    for choice in list(constraints[constraint]):
+        partial.append(choice)
+        removed = _select(constraints, choices, choice)
+        if algorithm_x(constraints, choices, partial) is not None:
+            return partial
+        _deselect(constraints, choices, choice, removed)
+        partial.pop()
+    return None
+
+
+def solve_exact_cover(propagator: Propagator) -> NDArray[int] | None:
+    """returns the solved board or None if there is no solution"""
+    constraints, choices = make_exact_cover(propagator)
+    # an empty cell or missing unit value without any choices can never be covered
+    missing = np.ones((propagator.geometry.num_units, propagator.size + 1), dtype=bool)
+    np.put_along_axis(missing, propagator.board[propagator.geometry.units], False, axis=1)
+    required = [('unit', u, v + 1) for u, v in np.argwhere(missing[:, 1:]).tolist()]
+    required += [('cell', c, 0) for c in np.flatnonzero(propagator.board == 0).tolist()]
+    if any(constraint not in constraints for constraint in required):
+        return None
+
+    solution = algorithm_x(constraints, choices, [])
+    if solution is None:
+        return None
+    board = propagator.board.copy()
+    for cell, value in solution:
+        board[cell] = value
+    return board.reshape(propagator.size, propagator.size)
@@ -0,0 +1,173 @@
+from functools import lru_cache
+from math import isqrt
+
+import numpy as np
+from attrs import define, field
+from numpy.typing import NDArray
+
+from sudoku.validators import is_valid_board_size
+
+
+CLASSIC = 'classic'
+DIAGONAL = 'diagonal'
+WINDOKU = 'windoku'
+
+
+class GeometryException(Exception):
+    pass
+
+
+def make_row_units(size: int) -> NDArray[int]:
+    return np.arange(size * size).reshape(size, size)
+
+
+def make_col_units(size: int) -> NDArray[int]:
+    return make_row_units(size).transpose().copy()
+
+
+def make_square_units(size: int) -> NDArray[int]:
+    side = isqrt(size)
+    cells = make_row_units(size).reshape(side, side, side, side)
+    return cells.transpose(0, 2, 1, 3).reshape(size, size)
+
+
+def make_diagonal_units(size: int) -> NDArray[int]:
+    """the main diagonal and the anti-diagonal"""
+    cells = make_row_units(size)
+    return np.vstack([cells.diagonal(), np.fliplr(cells).diagonal()])
+
+
+def make_window_units(size: int) -> NDArray[int]:
+    """the extra boxes of windoku, offset one cell in from the squares and separated by one cell"""
+    side = isqrt(size)
+    corners = range(1, size - side, side + 1)
+    cells = make_row_units(size)
+    return np.array([cells[r:r + side, c:c + side].ravel() for r in corners for c in corners]).reshape(-1, size)
+
+
+def make_region_units(regions: NDArray[int]) -> NDArray[int]:
+    """
+    units from a board shaped array that labels each cell with its region, as in jigsaw puzzles
+
+    Raises:
+        GeometryException: if the regions are not labelled 0 to size - 1 with size cells each
+    """
+    regions = np.asarray(regions)
+    size = len(regions)
+    flat = regions.ravel()
+    if regions.shape != (size, size) or not np.array_equal(np.bincount(flat, minlength=size), np.full(size, size)):
+        raise GeometryException(f'regions must label every cell with 0 to {size - 1}, {size} cells each')
+    return np.argsort(flat, kind='stable').reshape(size, size)
+
+
+@define(slots=False, eq=False)
+class Geometry:
+    """
+    the units of a board as arrays of flat cell indices (row * size + col). any set of units
+    works, but strategies that work on lines expect the rows and then the cols to come first
+    """
+    size: int
+    units: NDArray[int] = field(converter=np.asarray)
+    labels: tuple[str, ...] = field(default=None, repr=False)
+    # the name of the cached constructor that built this geometry, if any
+    kind: str = field(default=None)
+
+    num_cells: int = field(init=False, repr=False)
+    membership: NDArray[bool] = field(init=False, repr=False)
+    cell_units: tuple[NDArray[int], ...] = field(init=False, repr=False)
+    peers: tuple[NDArray[int], ...] = field(init=False, repr=False)
+    peer_matrix: NDArray[np.float32] = field(init=False, repr=False)
+    unit_rows: NDArray[int] = field(init=False, repr=False)
+    intersections: NDArray[int] = field(init=False, repr=False)
+    intersection_cells: NDArray[np.uint8] = field(init=False, repr=False)
+    label_index: dict[str, int] = field(init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        self.num_cells = self.size * self.size
+        if self.labels is None:
+            self.labels = tuple(f'unit {i}' for i in range(len(self.units)))
+        self.label_index = {label: i for i, label in enumerate(self.labels)}
+        if self.units.ndim != 2 or self.units.shape[1] != self.size:
+            raise GeometryException(f'units must have shape (n, {self.size}). got {self.units.shape}')
+
+        membership = np.zeros((self.num_cells, len(self.units)), dtype=bool)
+        membership[self.units, np.arange(len(self.units))[:, None]] = True
+        self.membership = membership
+        self.cell_units = tuple(np.flatnonzero(m) for m in membership)
+
+        shares_unit = (membership.astype(np.uint8) @ membership.T.astype(np.uint8)) > 0
+        np.fill_diagonal(shares_unit, False)
+        self.peers = tuple(np.flatnonzero(p) for p in shares_unit)
+        # float32 so that products with it run through BLAS
+        self.peer_matrix = shares_unit.astype(np.float32)
+        self.unit_rows = np.arange(len(self.units))[:, None]
+
+        # ordered pairs of units that share more than one cell (e.g. a square and a row)
+        overlap = membership.T.astype(int) @ membership.astype(int)
+        np.fill_diagonal(overlap, 0)
+        self.intersections = np.argwhere(overlap > 1)
+        a, b = self.intersections.T
+        self.intersection_cells = (membership[:, a] & membership[:, b]).T.astype(np.uint8)
+
+    @property
+    def num_units(self) -> int:
+        return len(self.units)
+
+    @property
+    def is_classic(self) -> bool:
+        return self.kind == CLASSIC
+
+    def __reduce_ex__(self, protocol):
+        """copies and unpickled copies of a cached geometry are the cached instance"""
+        if self.kind is not None:
+            return cached_geometry, (self.kind, self.size)
+        return super().__reduce_ex__(protocol)
+
+    def unit_index(self, label: str) -> int:
+        try:
+            return self.label_index[label]
+        except KeyError:
+            raise GeometryException(f'no unit labelled {label!r}')
+
+
+def make_geometry(size: int, kind: str = None, **units: NDArray[int]) -> Geometry:
+    """rows and cols followed by each keyword's units, labelled with the keyword"""
+    units = {'row': make_row_units(size), 'col': make_col_units(size), **units}
+    labels = tuple(f'{name} {i}' for name, u in units.items() for i in range(len(u)))
+    return Geometry(size, np.vstack(list(units.values())), labels, kind)
+
+
+@lru_cache(maxsize=None)
+def classic_geometry(size: int) -> Geometry:
+    if is_valid_board_size(size) is False:
+        raise GeometryException(f'Invalid puzzle size: {size}')
+    return make_geometry(size, CLASSIC, square=make_square_units(size))
+
+
+@lru_cache(maxsize=None)
+def diagonal_geometry(size: int) -> Geometry:
+    """sudoku x: each value also appears once on both long diagonals"""
+    if is_valid_board_size(size) is False:
+        raise GeometryException(f'Invalid puzzle size: {size}')
+    return make_geometry(size, DIAGONAL, square=make_square_units(size), diagonal=make_diagonal_units(size))
+
+
+@lru_cache(maxsize=None)
+def windoku_geometry(size: int) -> Geometry:
+    if is_valid_board_size(size) is False:
+        raise GeometryException(f'Invalid puzzle size: {size}')
+    return make_geometry(size, WINDOKU, square=make_square_units(size), window=make_window_units(size))
+
+
+def jigsaw_geometry(regions: NDArray[int]) -> Geometry:
+    """rows, cols and irregular regions in place of the squares"""
+    return make_geometry(len(regions), region=make_region_units(regions))
+
+
+def cached_geometry(kind: str, size: int) -> Geometry:
+    """the cached geometry built by the constructor named kind"""
+    constructors = {CLASSIC: classic_geometry, DIAGONAL: diagonal_geometry, WINDOKU: windoku_geometry}
+    try:
+        return constructors[kind](size)
+    except KeyError:
+        raise GeometryException(f'no cached geometry of kind {kind!r}')
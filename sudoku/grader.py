@@ -0,0 +1,135 @@
+from typing import Callable, Iterable
+
+import numpy as np
+from attrs import define, field
+
+from sudoku.puzzle import Board, PuzzleException, SudokuPuzzle
+from sudoku.candidates import make_candidates
+from sudoku.propagation import Propagator, fill_singles_batch, has_repeated_values
+from sudoku.search import SEARCH, SearchStats, search_batched
+from sudoku.strategies import eliminate_fish, eliminate_locked_candidates, eliminate_subsets
+from sudoku.templates import TEMPLATES, eliminate_templates
+
+SINGLES = 'singles'
+
+# strategies ordered from least to most powerful
+STRATEGIES: tuple[tuple[str, Callable[[Propagator], bool]], ...] = (
+    ('locked_candidates', eliminate_locked_candidates),
+    ('subsets', eliminate_subsets),
+    ('fish', eliminate_fish),
+    (TEMPLATES, eliminate_templates),
+)
+
+TECHNIQUE_WEIGHTS = {
+    SINGLES: 1,
+    'locked_candidates': 2,
+    'subsets': 3,
+    'fish': 4,
+    TEMPLATES: 5,
+    SEARCH: 6,
+}
+
+
+@define
+class Grade:
+    hardest: str
+    steps: dict[str, int] = field(factory=dict)
+    search_depth: int = 0
+    solved: bool = False
+    # why the puzzle could not be graded, set by grade_many instead of raising
+    error: str | None = None
+
+    @property
+    def score(self) -> float:
+        """weight of the hardest technique, plus a tenth per advanced step and one per level of search"""
+        advanced_steps = sum(n for name, n in self.steps.items() if name != SINGLES)
+        return TECHNIQUE_WEIGHTS[self.hardest] + 0.1 * advanced_steps + self.search_depth
+
+
+def deduce(propagator: Propagator, result: Grade) -> bool:
+    """apply the weakest productive strategy until solved or stuck. returns whether the board is solved"""
+    while True:
+        if propagator.fill_singles():
+            result.steps[SINGLES] = result.steps.get(SINGLES, 0) + 1
+        if propagator.is_solved:
+            return True
+
+        for name, strategy in STRATEGIES:
+            if strategy(propagator):
+                result.steps[name] = result.steps.get(name, 0) + 1
+                if TECHNIQUE_WEIGHTS[name] > TECHNIQUE_WEIGHTS[result.hardest]:
+                    result.hardest = name
+                break
+        else:
+            return False
+
+
+def _finish_grade(propagator: Propagator, result: Grade) -> Grade:
+    if deduce(propagator, result):
+        result.solved = True
+        return result
+
+    stats = SearchStats()
+    result.solved = search_batched(propagator, stats) is not None
+    result.hardest = SEARCH
+    result.steps[SEARCH] = stats.nodes
+    result.search_depth = stats.max_depth
+    return result
+
+
+def grade(puzzle: SudokuPuzzle | Board) -> Grade:
+    """
+    solve with the least powerful strategy that makes progress at each step
+
+    Raises:
+        ContradictionException: if the puzzle has no solution
+    """
+    if isinstance(puzzle, SudokuPuzzle):
+        propagator = Propagator.from_board(puzzle.board, puzzle.geometry)
+    else:
+        propagator = Propagator.from_board(puzzle)
+    return _finish_grade(propagator, Grade(SINGLES))
+
+
+def grade_many(puzzles: Iterable[SudokuPuzzle | Board]) -> list[Grade]:
+    """
+    grade puzzles in batches of the same geometry. candidates and the first round of singles
+    are computed for the whole batch at once, and only the puzzles left unsolved are graded
+    one at a time. a puzzle that grade would raise for gets an unsolved grade with an error
+    instead, so one bad puzzle does not lose the rest of the batch
+    """
+    puzzles = [p if isinstance(p, SudokuPuzzle) else SudokuPuzzle(p) for p in puzzles]
+    batches = {}
+    for i, puzzle in enumerate(puzzles):
+        batches.setdefault(id(puzzle.geometry), []).append(i)
+
+    grades = [Grade(SINGLES) for _ in puzzles]
+    for indices in batches.values():
+        geometry = puzzles[indices[0]].geometry
+        boards = np.stack([puzzles[i].board.ravel() for i in indices]).astype(int)
+        in_range = ((boards >= 0) & (boards <= geometry.size)).all(axis=1)
+        for i in np.array(indices)[~in_range].tolist():
+            grades[i] = _failed_grade(f'board values must be from 0 to {geometry.size}')
+        indices, boards = np.array(indices)[in_range].tolist(), boards[in_range]
+
+        candidates = make_candidates(boards, geometry)
+        filled, failed = fill_singles_batch(boards, candidates, geometry)
+        failed |= has_repeated_values(boards, geometry)
+        for i, board, board_candidates, num_filled, contradiction in zip(indices, boards, candidates, filled, failed):
+            if contradiction:
+                grades[i] = _failed_grade('puzzle has no solution')
+                continue
+            if num_filled:
+                grades[i].steps[SINGLES] = 1
+            if board.all():
+                grades[i].solved = True
+                continue
+            try:
+                grades[i] = _finish_grade(Propagator(geometry, board, board_candidates), grades[i])
+            except PuzzleException as e:
+                grades[i] = _failed_grade(str(e))
+    return grades
+
+
+def _failed_grade(error: str) -> Grade:
+    return Grade(SINGLES, error=error)
@@ -94,3 +94,7 @@ class Col(Group):
 class Square(Group):
     array: SquareArray = field(eq=cmp_using(eq=np.array_equal), converter=convert_to_square_array)
 
+
+@define(slots=False)
+class Unit(Group):
+    """any unit of a puzzle's geometry. index is the unit's position in the geometry"""
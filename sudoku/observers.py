@@ -0,0 +1,166 @@
+import json
+import os
+from pathlib import Path
+from struct import Struct
+from time import perf_counter
+from typing import Iterator
+
+from attrs import define, field, frozen
+
+
+class SolverObserver:
+    """
+    receives solver events. solvers only check whether an observer is set, so nothing is
+    called or formatted when there is none
+    """
+
+    def on_place(self, cell: int, value: int, strategy: str | None):
+        pass
+
+    def on_eliminate(self, cell: int, value: int):
+        pass
+
+    def on_branch(self, cell: int, value: int, depth: int):
+        pass
+
+    def on_backtrack(self, depth: int):
+        pass
+
+    def on_solution(self, depth: int):
+        """the branch taken at depth led to a solution"""
+        pass
+
+    def on_iteration(self, unit: int, num_queued: int):
+        pass
+
+
+@define
+class ObserverGroup(SolverObserver):
+    observers: list[SolverObserver] = field(factory=list)
+
+    def on_place(self, cell, value, strategy):
+        for observer in self.observers:
+            observer.on_place(cell, value, strategy)
+
+    def on_eliminate(self, cell, value):
+        for observer in self.observers:
+            observer.on_eliminate(cell, value)
+
+    def on_branch(self, cell, value, depth):
+        for observer in self.observers:
+            observer.on_branch(cell, value, depth)
+
+    def on_backtrack(self, depth):
+        for observer in self.observers:
+            observer.on_backtrack(depth)
+
+    def on_solution(self, depth):
+        for observer in self.observers:
+            observer.on_solution(depth)
+
+    def on_iteration(self, unit, num_queued):
+        for observer in self.observers:
+            observer.on_iteration(unit, num_queued)
+
+
+PLACE, ELIMINATE, BRANCH, BACKTRACK, ITERATION, SOLUTION = range(6)
+EVENT_NAMES = ('place', 'eliminate', 'branch', 'backtrack', 'iteration', 'solution')
+TRACE_RECORD = Struct('<BHBHQ')
+
+
+@frozen
+class TraceRecord:
+    event: int
+    cell: int
+    value: int
+    aux: int
+    time_us: int
+
+    @property
+    def name(self) -> str:
+        return EVENT_NAMES[self.event]
+
+
+@define
+class BinaryTraceObserver(SolverObserver):
+    """
+    records events as fixed size little endian records: event (u8), cell (u16), value (u8),
+    aux (u16, the search depth or queue length) and microseconds since creation (u64)
+    """
+    buffer: bytearray = field(factory=bytearray, repr=False)
+    start: float = field(factory=perf_counter, repr=False)
+
+    def _append(self, event: int, cell: int, value: int, aux: int):
+        self.buffer += TRACE_RECORD.pack(event, cell, value, aux, int((perf_counter() - self.start) * 1e6))
+
+    def on_place(self, cell, value, strategy):
+        self._append(PLACE, cell, value, 0)
+
+    def on_eliminate(self, cell, value):
+        self._append(ELIMINATE, cell, value, 0)
+
+    def on_branch(self, cell, value, depth):
+        self._append(BRANCH, cell, value, depth)
+
+    def on_backtrack(self, depth):
+        self._append(BACKTRACK, 0, 0, depth)
+
+    def on_solution(self, depth):
+        self._append(SOLUTION, 0, 0, depth)
+
+    def on_iteration(self, unit, num_queued):
+        self._append(ITERATION, unit, 0, num_queued)
+
+    def __len__(self) -> int:
+        return len(self.buffer) // TRACE_RECORD.size
+
+    def to_bytes(self) -> bytes:
+        return bytes(self.buffer)
+
+    @staticmethod
+    def iter_records(data: bytes) -> Iterator[TraceRecord]:
+        for fields in TRACE_RECORD.iter_unpack(data):
+            yield TraceRecord(*fields)
+
+
+@define
+class ChromeTraceObserver(SolverObserver):
+    """
+    collects events in the chrome trace event format, for chrome://tracing or perfetto.
+    search branches are duration events so the search tree shows as nested spans
+    """
+    events: list[dict] = field(factory=list, repr=False)
+    start: float = field(factory=perf_counter, repr=False)
+    pid: int = field(factory=os.getpid)
+
+    def _event(self, name: str, phase: str, **args):
+        event = {'name': name, 'ph': phase, 'ts': (perf_counter() - self.start) * 1e6, 'pid': self.pid, 'tid': 0}
+        if phase == 'i':
+            event['s'] = 't'
+        if args:
+            event['args'] = args
+        self.events.append(event)
+
+    def on_place(self, cell, value, strategy):
+        self._event(strategy or 'place', 'i', cell=cell, value=value)
+
+    def on_eliminate(self, cell, value):
+        self._event('eliminate', 'i', cell=cell, value=value)
+
+    def on_branch(self, cell, value, depth):
+        self._event('branch', 'B', cell=cell, value=value, depth=depth)
+
+    def on_backtrack(self, depth):
+        self._event('branch', 'E')
+
+    def on_solution(self, depth):
+        self._event('branch', 'E', solved=True)
+
+    def on_iteration(self, unit, num_queued):
+        self._event('queue', 'C', queued=num_queued)
+
+    def to_json(self) -> str:
+        return json.dumps({'traceEvents': self.events, 'displayTimeUnit': 'ms'})
+
+    def write(self, path: Path | str):
+        Path(path).write_text(self.to_json())
@@ -0,0 +1,190 @@
+import logging
+import os
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor, TimeoutError
+from multiprocessing import Pool
+from time import time
+from typing import Iterable
+
+import numpy as np
+from attrs import define, field, frozen
+from numpy.typing import NDArray
+
+from sudoku.geometry import Geometry, classic_geometry
+from sudoku.puzzle import Board, SudokuPuzzle
+from sudoku.propagation import ContradictionException, Propagator
+from sudoku.search import (SearchLimitException, SearchScratch, count_solutions, iter_branches, search,
+                           search_in_scratch)
+
+logger = logging.getLogger(__name__)
+
+# the geometry is None for classic puzzles so that it is not pickled with every task
+Subproblem = tuple[NDArray[int], NDArray[bool], Geometry | None]
+
+
+def split(propagator: Propagator, num_tasks: int) -> list[Propagator]:
+    """expand the search tree breadth first until there are at least num_tasks open branches"""
+    frontier = deque([propagator])
+    leaves = []
+    while frontier and len(frontier) + len(leaves) < num_tasks:
+        node = frontier.popleft()
+        if node.is_solved:
+            leaves.append(node)
+            continue
+        frontier.extend(iter_branches(node))
+    return leaves + list(frontier)
+
+
+def _to_subproblem(propagator: Propagator) -> Subproblem:
+    geometry = None if propagator.geometry.is_classic else propagator.geometry
+    return propagator.board, propagator.candidates, geometry
+
+
+def _from_subproblem(subproblem: Subproblem) -> Propagator:
+    board, candidates, geometry = subproblem
+    return Propagator(geometry or classic_geometry(int(np.sqrt(board.size))), board, candidates)
+
+
+def _search_subproblem(subproblem: Subproblem) -> NDArray[int] | None:
+    solved = search(_from_subproblem(subproblem))
+    return None if solved is None else solved.to_board()
+
+
+def _count_subproblem(subproblem: Subproblem) -> int:
+    return count_solutions(_from_subproblem(subproblem))
+
+
+def _prepare(puzzle: SudokuPuzzle | Board, processes: int, tasks_per_process: int) -> list[Subproblem] | None:
+    board, geometry = (puzzle.board, puzzle.geometry) if isinstance(puzzle, SudokuPuzzle) else (puzzle, None)
+    try:
+        propagator = Propagator.from_board(board, geometry).propagate()
+    except ContradictionException:
+        return None
+    return [_to_subproblem(p) for p in split(propagator, processes * tasks_per_process)]
+
+
+def solve_parallel(puzzle: SudokuPuzzle | Board, processes: int = None,
+                   tasks_per_process: int = 4) -> NDArray[int] | None:
+    """
+    split the search tree into independent subproblems and search them in a process pool.
+    idle workers pull the next subproblem, and the pool is terminated once a solution is found
+
+    Returns:
+        the solved board or None if the puzzle has no solution
+    """
+    processes = processes or os.cpu_count()
+    with Pool(processes) as pool:
+        subproblems = _prepare(puzzle, processes, tasks_per_process)
+        if subproblems is None:
+            return None
+        logger.debug(f'searching {len(subproblems)} subproblems')
+        for solved in pool.imap_unordered(_search_subproblem, subproblems):
+            if solved is not None:
+                pool.terminate()
+                return solved
+    return None
+
+
+def count_solutions_parallel(puzzle: SudokuPuzzle | Board, processes: int = None, tasks_per_process: int = 4) -> int:
+    processes = processes or os.cpu_count()
+    with Pool(processes) as pool:
+        subproblems = _prepare(puzzle, processes, tasks_per_process)
+        if subproblems is None:
+            return 0
+        return sum(pool.imap_unordered(_count_subproblem, subproblems))
+
+
+_thread_scratch = threading.local()
+
+
+def get_thread_scratch(geometry: Geometry) -> SearchScratch:
+    """the calling thread's search buffers for boards with geometry's shape, allocated on first use"""
+    buffers = getattr(_thread_scratch, 'buffers', None)
+    if buffers is None:
+        buffers = _thread_scratch.buffers = {}
+    key = geometry.size, geometry.num_units
+    if key not in buffers:
+        buffers[key] = SearchScratch.for_geometry(geometry)
+    return buffers[key]
+
+
+def solve_board(board: Board, geometry: Geometry = None, deadline: float = None,
+                node_limit: int = None) -> NDArray[int] | None:
+    """
+    solve without touching shared state: the input is copied into the calling thread's scratch
+    buffers and a new board is returned. returns None if there is no solution
+
+    Raises:
+        SearchLimitException: if the deadline passes or more than node_limit nodes are searched
+    """
+    board = np.asarray(board)
+    geometry = geometry or classic_geometry(len(board))
+    if deadline is not None and time() > deadline:
+        raise SearchLimitException('deadline passed before solving started')
+    scratch = get_thread_scratch(geometry)
+    try:
+        propagator = scratch.load_board(board, geometry).propagate(None if deadline is None else deadline - time())
+    except ContradictionException:
+        return None
+    solved = search_in_scratch(propagator, scratch, node_limit=node_limit, deadline=deadline)
+    return None if solved is None else solved.to_board()
+
+
+@frozen
+class Submission:
+    """a puzzle being solved on a ThreadPoolSolver and the time its result is due by"""
+    future: Future
+    deadline: float | None
+
+
+@define
+class ThreadPoolSolver:
+    """
+    solve concurrent requests on a thread pool. each thread searches in its own preallocated
+    buffers, so no puzzles or solvers are shared between threads and nothing is pickled.
+    each puzzle must be solved within timeout seconds of being submitted, including time
+    spent waiting for a free thread, or SearchLimitException is raised
+    """
+    max_workers: int = None
+    timeout: float | None = 10
+    node_limit: int | None = None
+    executor: ThreadPoolExecutor = field(init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        self.executor = ThreadPoolExecutor(self.max_workers, thread_name_prefix='sudoku')
+
+    def submit(self, puzzle: SudokuPuzzle | Board) -> Submission:
+        deadline = None if self.timeout is None else time() + self.timeout
+        if isinstance(puzzle, SudokuPuzzle):
+            board, geometry = puzzle.board.copy(), puzzle.geometry
+        else:
+            board, geometry = np.array(puzzle), None
+        return Submission(self.executor.submit(solve_board, board, geometry, deadline, self.node_limit), deadline)
+
+    def result(self, submission: Submission) -> NDArray[int] | None:
+        """
+        wait for a submitted puzzle until its deadline. a thread only checks the deadline between
+        search nodes, so a second is allowed for it to notice
+        """
+        deadline = submission.deadline
+        try:
+            return submission.future.result(None if deadline is None else max(deadline - time(), 0) + 1)
+        except TimeoutError:
+            submission.future.cancel()
+            raise SearchLimitException(f'no result within {self.timeout}s')
+
+    def solve(self, puzzle: SudokuPuzzle | Board) -> NDArray[int] | None:
+        return self.result(self.submit(puzzle))
+
+    def solve_many(self, puzzles: Iterable[SudokuPuzzle | Board]) -> list[NDArray[int] | None]:
+        return [self.result(f) for f in [self.submit(p) for p in puzzles]]
+
+    def close(self):
+        self.executor.shutdown()
+
+    def __enter__(self) -> 'ThreadPoolSolver':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
@@ -0,0 +1,105 @@
+import logging
+import multiprocessing
+from collections import Counter
+from queue import Empty
+from time import time
+from typing import Callable
+
+from attrs import define, field
+from numpy.typing import NDArray
+
+from sudoku.exact_cover import solve_exact_cover
+from sudoku.geometry import Geometry
+from sudoku.grader import SINGLES, Grade, deduce
+from sudoku.puzzle import Board, SudokuPuzzle
+from sudoku.propagation import ContradictionException, Propagator
+from sudoku.search import search, search_with_restarts
+
+logger = logging.getLogger(__name__)
+
+
+def solve_with_strategies(propagator: Propagator) -> NDArray[int] | None:
+    if deduce(propagator, Grade(SINGLES)):
+        return propagator.to_board()
+    return None
+
+
+def solve_with_search(propagator: Propagator) -> NDArray[int] | None:
+    solved = search(propagator)
+    return None if solved is None else solved.to_board()
+
+
+def solve_with_restarts(propagator: Propagator) -> NDArray[int] | None:
+    solved = search_with_restarts(propagator)
+    return None if solved is None else solved.to_board()
+
+
+CONFIGURATIONS: dict[str, Callable[[Propagator], NDArray[int] | None]] = {
+    'strategies': solve_with_strategies,
+    'mrv_search': solve_with_search,
+    'random_restarts': solve_with_restarts,
+    'exact_cover': solve_exact_cover,
+}
+
+
+def _run_configuration(name: str, board: NDArray[int], results: multiprocessing.Queue, geometry: Geometry = None):
+    try:
+        solved = CONFIGURATIONS[name](Propagator.from_board(board, geometry).propagate())
+    except ContradictionException:
+        solved = None
+    results.put((name, solved))
+
+
+@define
+class PortfolioResult:
+    board: NDArray[int] | None = field(repr=False)
+    winner: str | None
+    elapsed: float
+
+
+@define
+class PortfolioSolver:
+    """
+    race several solver configurations in separate processes and keep the first answer
+    """
+    configurations: tuple[str, ...] = field(default=tuple(CONFIGURATIONS), converter=tuple)
+    timeout: float = field(default=10, eq=False)
+    wins: Counter = field(factory=Counter, eq=False, repr=False)
+
+    @configurations.validator
+    def _check_configurations(self, attribute, value):
+        unknown = set(value) - set(CONFIGURATIONS)
+        if unknown:
+            raise ValueError(f'unknown configurations: {sorted(unknown)}')
+
+    def solve(self, puzzle: SudokuPuzzle | Board) -> PortfolioResult:
+        board, geometry = (puzzle.board, puzzle.geometry) if isinstance(puzzle, SudokuPuzzle) else (puzzle, None)
+        timer = time()
+        results = multiprocessing.Queue()
+        processes = [multiprocessing.Process(target=_run_configuration, args=(name, board, results, geometry),
+                                             daemon=True)
+                     for name in self.configurations]
+        for process in processes:
+            process.start()
+
+        result = PortfolioResult(None, None, 0)
+        try:
+            for _ in processes:
+                remaining = self.timeout - (time() - timer)
+                name, solved = results.get(timeout=max(remaining, 0))
+                if solved is not None:
+                    result = PortfolioResult(solved, name, time() - timer)
+                    break
+                logger.debug(f'{name} finished without a solution')
+        except Empty:
+            logger.info(f'portfolio timed out after {self.timeout}s')
+        finally:
+            for process in processes:
+                if process.is_alive():
+                    process.terminate()
+                process.join()
+
+        if result.winner is not None:
+            self.wins[result.winner] += 1
+        result.elapsed = time() - timer
+        return result
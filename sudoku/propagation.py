@@ -0,0 +1,292 @@
+import logging
+from collections import deque
+from time import time
+from typing import TYPE_CHECKING, Iterator
+
+import numpy as np
+from attrs import define, field
+from numpy.typing import NDArray
+
+from sudoku.candidates import make_candidates
+from sudoku.geometry import Geometry, classic_geometry
+from sudoku.puzzle import PuzzleException
+
+if TYPE_CHECKING:
+    from sudoku.observers import SolverObserver
+
+logger = logging.getLogger(__name__)
+
+
+ONE_MISSING = 'group_with_one_missing'
+NAKED_SINGLE = 'naked_single'
+HIDDEN_SINGLE = 'hidden_single'
+
+
+class ContradictionException(PuzzleException):
+    pass
+
+
+@define(slots=False)
+class Propagator:
+    """
+    worklist driven constraint propagation. only units touched by a placement or an
+    elimination are queued and re-checked for naked and hidden singles
+    """
+    geometry: Geometry = field(repr=False)
+    board: NDArray[int] = field(converter=np.asarray)
+    candidates: NDArray[bool] = field(repr=False)
+    queue: deque = field(factory=deque, repr=False)
+    queued: NDArray[bool] = field(default=None, repr=False)
+    observer: 'SolverObserver | None' = field(default=None, repr=False)
+
+    def __attrs_post_init__(self):
+        if self.queued is None:
+            self.queued = np.zeros(self.geometry.num_units, dtype=bool)
+
+    @classmethod
+    def from_board(cls, board: NDArray[int], geometry: Geometry = None,
+                   observer: 'SolverObserver' = None) -> 'Propagator':
+        """
+        Raises:
+            PuzzleException: if a value is outside 0 to size
+            ContradictionException: if a value is repeated in a unit
+        """
+        board = np.asarray(board)
+        if geometry is None:
+            geometry = classic_geometry(len(board))
+        flat = board.reshape(geometry.num_cells).astype(int)
+        check_board(flat, geometry)
+        propagator = cls(geometry, flat, make_candidates(flat, geometry), observer=observer)
+        propagator.enqueue(np.arange(geometry.num_units))
+        return propagator
+
+    @property
+    def size(self) -> int:
+        return self.geometry.size
+
+    @property
+    def num_empty_cells(self) -> int:
+        return int(np.count_nonzero(self.board == 0))
+
+    @property
+    def is_solved(self) -> bool:
+        return self.num_empty_cells == 0
+
+    def copy(self) -> 'Propagator':
+        return Propagator(self.geometry, self.board.copy(), self.candidates.copy(),
+                          deque(self.queue), self.queued.copy(), self.observer)
+
+    def to_board(self) -> NDArray[int]:
+        return self.board.reshape(self.size, self.size).copy()
+
+    def enqueue(self, units: NDArray[int]):
+        for u in units[~self.queued[units]]:
+            self.queue.append(u)
+        self.queued[units] = True
+
+    def place(self, cell: int, value: int, strategy: str = None) -> bool:
+        """returns False if the value was already placed"""
+        current = self.board[cell]
+        if current == value:
+            return False
+        if current != 0 or not self.candidates[cell, value - 1]:
+            raise ContradictionException(f'unable to place {value} in cell {divmod(cell, self.size)}')
+
+        self.board[cell] = value
+        self.candidates[cell] = False
+        peers = self.geometry.peers[cell]
+        changed = peers[self.candidates[peers, value - 1]]
+        self.candidates[changed, value - 1] = False
+        if self.observer is not None:
+            self.observer.on_place(int(cell), int(value), strategy)
+            for peer in changed.tolist():
+                self.observer.on_eliminate(peer, int(value))
+
+        self.enqueue(self.geometry.cell_units[cell])
+        if changed.size:
+            self.enqueue(np.nonzero(self.geometry.membership[changed].any(0))[0])
+        return True
+
+    def clear(self, cell: int):
+        """empty a cell and restore the candidates that its value had removed"""
+        value = self.board[cell]
+        if value == 0:
+            return
+        self.board[cell] = 0
+        geometry = self.geometry
+
+        unit_values = self.board[geometry.units[geometry.cell_units[cell]]].ravel()
+        self.candidates[cell] = True
+        self.candidates[cell, unit_values[unit_values > 0] - 1] = False
+
+        peers = geometry.peers[cell]
+        for peer in peers[self.board[peers] == 0]:
+            self.candidates[peer, value - 1] = not (self.board[geometry.units[geometry.cell_units[peer]]] == value).any()
+
+        self.enqueue(geometry.cell_units[cell])
+        self.enqueue(np.nonzero(geometry.membership[peers].any(0))[0])
+
+    def eliminate(self, cell: int, value: int):
+        if self.candidates[cell, value - 1]:
+            self.candidates[cell, value - 1] = False
+            if self.observer is not None:
+                self.observer.on_eliminate(int(cell), int(value))
+            self.enqueue(self.geometry.cell_units[cell])
+
+    def find_unit_singles(self, unit: int) -> list[tuple[int, int, str]]:
+        """naked and hidden singles of a unit as (cell, value, strategy)"""
+        cells = self.geometry.units[unit]
+        values = self.board[cells]
+        if values.all():
+            return []
+        sub = self.candidates[cells]
+        candidates_per_cell = sub.sum(1)
+        cells_per_value = sub.sum(0)
+        missing = np.bincount(values, minlength=self.size + 1)[1:] == 0
+
+        if ((candidates_per_cell == 0) & (values == 0)).any():
+            raise ContradictionException(f'cell in unit {unit} has no possible values')
+        if ((cells_per_value == 0) & missing).any():
+            raise ContradictionException(f'value missing from unit {unit} has no possible cells')
+
+        naked = ONE_MISSING if missing.sum() == 1 else NAKED_SINGLE
+        singles = [(cells[i], int(sub[i].argmax()) + 1, naked) for i in np.nonzero(candidates_per_cell == 1)[0]]
+        singles.extend((cells[sub[:, v].argmax()], v + 1, HIDDEN_SINGLE) for v in np.nonzero(cells_per_value == 1)[0])
+        return singles
+
+    def iter_propagate(self, timeout: float = None) -> Iterator[tuple[int, int, str]]:
+        """propagate, yielding each placement as (cell, value, strategy)"""
+        timer = time()
+        while self.queue:
+            if timeout is not None and time() - timer > timeout:
+                logger.info('propagation timed out')
+                break
+            unit = self.queue.popleft()
+            self.queued[unit] = False
+            if self.observer is not None:
+                self.observer.on_iteration(int(unit), len(self.queue))
+            for cell, value, strategy in self.find_unit_singles(unit):
+                if self.place(cell, value, strategy):
+                    yield cell, value, strategy
+
+    def fill_singles(self) -> int:
+        """
+        place every naked and hidden single on the board at once, repeating until there are none.
+        checks all units each round instead of following the queue, which is faster when most of
+        the board changes. returns the number of cells filled
+        """
+        boards, candidates = self.board[None], self.candidates[None]
+        filled = 0
+        while True:
+            singles, failed = find_singles_batch(boards, candidates, self.geometry)
+            if failed[0]:
+                raise ContradictionException('board has a cell or value with no possibilities left')
+            cells, value_idx = np.nonzero(singles[0])
+            if cells.size == 0:
+                break
+            naked = self.candidates[cells].sum(axis=1) == 1
+            if place_singles_batch(boards, candidates, singles, self.geometry)[0]:
+                raise ContradictionException('singles place the same value twice in a unit')
+            filled += cells.size
+            if self.observer is not None:
+                for cell, value, is_naked in zip(cells.tolist(), (value_idx + 1).tolist(), naked.tolist()):
+                    self.observer.on_place(cell, value, NAKED_SINGLE if is_naked else HIDDEN_SINGLE)
+
+        self.queue.clear()
+        self.queued[:] = False
+        return filled
+
+    def propagate(self, timeout: float = None) -> 'Propagator':
+        for _ in self.iter_propagate(timeout):
+            pass
+        return self
+
+
+def check_board(board: NDArray[int], geometry: Geometry):
+    """
+    Raises:
+        PuzzleException: if a value of the flat board is outside 0 to size
+        ContradictionException: if a value is repeated in a unit
+    """
+    if not ((board >= 0) & (board <= geometry.size)).all():
+        raise PuzzleException(f'board values must be from 0 to {geometry.size}')
+    if has_repeated_values(board, geometry):
+        raise ContradictionException('board has a value repeated in a unit')
+
+
+def has_repeated_values(boards: NDArray[int], geometry: Geometry) -> NDArray[bool] | bool:
+    """whether a value is repeated in a unit of each flat board (or of a single board)"""
+    unit_values = np.sort(boards[..., geometry.units], axis=-1)
+    return ((unit_values[..., 1:] == unit_values[..., :-1]) & (unit_values[..., 1:] != 0)).any(axis=(-2, -1))
+
+
+def find_singles_batch(boards: NDArray[int], candidates: NDArray[bool],
+                       geometry: Geometry) -> tuple[NDArray[bool], NDArray[bool]]:
+    """
+    naked and hidden singles of many boards at once
+
+    Args:
+        boards: flat boards of shape (N, num_cells)
+        candidates: candidate tensors of shape (N, num_cells, size)
+        geometry: the units shared by every board
+
+    Returns:
+        the singles as a (N, num_cells, size) mask, and which boards have a contradiction.
+        boards with a contradiction get no singles
+    """
+    num_boards = len(boards)
+    candidates_per_cell = candidates.sum(axis=2, dtype=np.uint8)
+    failed = ((boards == 0) & (candidates_per_cell == 0)).any(axis=1)
+
+    unit_candidates = candidates[:, geometry.units]  # (boards, units, cells, values)
+    cells_per_value = unit_candidates.sum(axis=2, dtype=np.uint8)
+    missing = np.ones((num_boards, geometry.num_units, geometry.size + 1), dtype=bool)
+    missing[np.arange(num_boards)[:, None, None], geometry.unit_rows, boards[:, geometry.units]] = False
+    failed |= ((cells_per_value == 0) & missing[..., 1:]).any(axis=(1, 2))
+
+    singles = candidates & (candidates_per_cell == 1)[..., None]
+    board_idx, unit_idx, value_idx = np.nonzero(cells_per_value == 1)
+    positions = unit_candidates[board_idx, unit_idx, :, value_idx].argmax(axis=1)
+    singles[board_idx, geometry.units[unit_idx, positions], value_idx] = True
+
+    # a cell that is the only place for two values
+    failed |= (singles.sum(axis=2, dtype=np.uint8) > 1).any(axis=1)
+    singles[failed] = False
+    return singles, failed
+
+
+def place_singles_batch(boards: NDArray[int], candidates: NDArray[bool], singles: NDArray[bool],
+                        geometry: Geometry) -> NDArray[bool]:
+    """
+    place singles found by find_singles_batch and remove their values from the peers' candidates
+
+    Returns:
+        which boards placed the same value twice in a unit
+    """
+    board_idx, cells, value_idx = np.nonzero(singles)
+    boards[board_idx, cells] = value_idx + 1
+    candidates[board_idx, cells] = False
+    blocked = (geometry.peer_matrix @ singles.astype(np.float32)) > 0
+    candidates &= ~blocked
+    return (blocked & singles).any(axis=(1, 2))
+
+
+def fill_singles_batch(boards: NDArray[int], candidates: NDArray[bool],
+                       geometry: Geometry) -> tuple[NDArray[int], NDArray[bool]]:
+    """
+    Propagator.fill_singles for many boards with the same geometry, updating them in place.
+    boards that reach a contradiction are left as they were at that point
+
+    Returns:
+        the number of cells filled on each board, and which boards have a contradiction
+    """
+    filled = np.zeros(len(boards), dtype=int)
+    failed = np.zeros(len(boards), dtype=bool)
+    while True:
+        singles, contradiction = find_singles_batch(boards, candidates, geometry)
+        failed |= contradiction
+        num_singles = singles.sum(axis=(1, 2))
+        if not num_singles.any():
+            return filled, failed
+        failed |= place_singles_batch(boards, candidates, singles, geometry)
+        filled += num_singles
@@ -1,17 +1,24 @@
+from functools import lru_cache
 from math import isqrt
 from typing import Sequence
 
 import numpy as np
-from attrs import cmp_using, define, evolve, field
+from attrs import cmp_using, define, field
 from numpy.typing import NDArray
 
-from sudoku.groups import Col, Group, Row, Square
+from sudoku.candidates import find_hidden_singles, make_candidates
+from sudoku.encoding import pack_board, unpack_board
+from sudoku.geometry import Geometry, GeometryException, classic_geometry
+from sudoku.groups import Col, Group, Row, Square, Unit
 from sudoku.validators import is_valid_board_size
 
 Board = np.ndarray | Sequence[np.ndarray | Sequence[int]]
 
 dtype_coord = [('row', 'int'), ('col', 'int')]
 
+CELL_CHARS = '0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+EMPTY_CELL_CHARS = '0.'
+
 
 def rows_to_cols(rows: np.ndarray) -> np.ndarray:
     return np.transpose(rows)
@@ -49,6 +56,16 @@ def make_squares(board, board_size, square_size) -> list[NDArray[int]]:
     return groups
 
 
+@lru_cache(maxsize=None)
+def make_coord_tables(size: int) -> tuple[NDArray, NDArray]:
+    """the (row, col) coordinates of every cell, by row and by square. built once per size and read only"""
+    coord_array = np.array([[(i, j) for j in range(size)] for i in range(size)], dtype=dtype_coord)
+    coord_array_squares = np.array(make_squares(coord_array, size, isqrt(size)))
+    coord_array.flags.writeable = False
+    coord_array_squares.flags.writeable = False
+    return coord_array, coord_array_squares
+
+
 class PuzzleException(Exception):
     pass
 
@@ -60,22 +77,23 @@ class SudokuPuzzle:
     """
     # dtype: Type[np.number] = np.uint
     board: NDArray[int] = field(eq=cmp_using(eq=np.array_equal), converter=np.array)
+    geometry: Geometry = field(default=None, eq=False, repr=False)
 
     size: int = field(init=False, eq=False, repr=False)
     square_group_side_len: int = field(init=False, eq=False, repr=False)
     square_group_shape: tuple[int, int] = field(init=False, eq=False, repr=False)
-    coord_array: NDArray[NDArray[NDArray[int]]] = field(init=False, eq=False, repr=False)
-    coord_array_squares: NDArray[NDArray[NDArray[NDArray[int]]]] = field(init=False, eq=False, repr=False)
     value_range: NDArray[int] = field(init=False, eq=False, repr=False)
 
     def __attrs_post_init__(self):
         self.size = len(self.board[0])
         self.validate_board_size()
+        if self.geometry is None:
+            self.geometry = classic_geometry(self.size)
+        elif self.geometry.size != self.size:
+            raise PuzzleException(f'geometry of size {self.geometry.size} does not fit a board of size {self.size}')
 
         self.square_group_side_len = int(np.sqrt(self.size))
         self.square_group_shape = (self.square_group_side_len, self.square_group_side_len)
-        self.coord_array = self._make_coord_array()
-        self.coord_array_squares = np.array(make_squares(self.coord_array, self.size, self.square_group_side_len))
         self.value_range = np.array(range(1, self.size + 1))
 
     def validate_board_size(self):
@@ -94,9 +112,18 @@ class SudokuPuzzle:
     def squares(self) -> list[Square]:
         return [Square(i, s) for i, s in enumerate(make_squares(self.board, self.size, self.square_group_side_len))]
 
-    def _make_coord_array(self) -> NDArray[NDArray[NDArray]]:
-        return np.array(
-            [np.array([(i, j) for j, col in enumerate(row)], dtype=dtype_coord) for i, row in enumerate(self.board)])
+    @property
+    def units(self) -> list[Unit]:
+        """every unit of the geometry, including variant units such as diagonals or jigsaw regions"""
+        return [Unit(i, v) for i, v in enumerate(self.board.ravel()[self.geometry.units])]
+
+    @property
+    def coord_array(self) -> NDArray[NDArray[NDArray[int]]]:
+        return make_coord_tables(self.size)[0]
+
+    @property
+    def coord_array_squares(self) -> NDArray[NDArray[NDArray[NDArray[int]]]]:
+        return make_coord_tables(self.size)[1]
 
     def get_cell(self, row: int, col: int) -> Cell:
         return Cell(row, col, self.board[row][col])
@@ -106,17 +133,38 @@ class SudokuPuzzle:
             value = cell.value
         self.board[cell.row][cell.col] = value
 
+    def get_cells(self, indices: NDArray[int]) -> NDArray[int]:
+        """values at flat cell indices (row * size + col)"""
+        return self.board.ravel()[indices]
+
+    def put_cells(self, indices: NDArray[int], values: NDArray[int] | int):
+        np.put(self.board, indices, values)
+
+    def get_indices_of_group(self, group: Group) -> tuple[NDArray[int], NDArray[int]]:
+        """flat indices of the group's cells and their values"""
+        indices = self.geometry.units[self.get_unit_index(group)]
+        return indices, self.get_cells(indices)
+
+    def get_indices_from_row(self, row: Row) -> tuple[NDArray[int], NDArray[int]]:
+        return self.get_indices_of_group(row)
+
+    def get_indices_from_col(self, col: Col) -> tuple[NDArray[int], NDArray[int]]:
+        return self.get_indices_of_group(col)
+
+    def get_indices_from_square(self, sq: Square) -> tuple[NDArray[int], NDArray[int]]:
+        return self.get_indices_of_group(sq)
+
     def get_row_from_cell(self, cell: Cell) -> Row:
         return self.rows[cell.row]
 
     def get_cells_from_row(self, row: Row) -> list[Cell]:
-        return [Cell.from_coords(c) for c in self.coord_array[row.index]]
+        return [self.get_cell(*c) for c in self.coord_array[row.index]]
 
     def get_col_from_cell(self, cell: Cell) -> Col:
         return self.cols[cell.col]
 
     def get_cells_from_col(self, col: Col) -> list[Cell]:
-        return [Cell.from_coords(c) for c in self.coord_array.transpose()[col.index]]
+        return [self.get_cell(*c) for c in self.coord_array.transpose()[col.index]]
 
     def get_square_from_cell(self, cell: Cell) -> Square:
         coords_square = self.coord_array_squares
@@ -127,7 +175,7 @@ class SudokuPuzzle:
 
     def get_cells_from_square(self, sq: Square) -> list[Cell]:
         coords_squares = self.coord_array_squares
-        return [Cell.from_coords(c) for c in coords_squares[sq.index].flatten()]
+        return [self.get_cell(*c) for c in coords_squares[sq.index].flatten()]
 
     def get_missing_values_of_group(self, group: Group | NDArray):
         if isinstance(group, Group):
@@ -136,40 +184,38 @@ class SudokuPuzzle:
             arr = group
         return np.setdiff1d(self.value_range, arr)
 
+    @property
+    def candidates(self) -> NDArray[bool]:
+        return make_candidates(self.board.ravel(), self.geometry)
+
+    def get_unit_index(self, group: Group) -> int:
+        if isinstance(group, Unit):
+            return group.index
+        for kind, label in ((Row, 'row'), (Col, 'col'), (Square, 'square')):
+            if isinstance(group, kind):
+                try:
+                    return self.geometry.unit_index(f'{label} {group.index}')
+                except GeometryException:
+                    break
+        raise PuzzleException('unable to determine coordinates for group')
+
+    def find_hidden_singles(self, units: NDArray[int] = None) -> tuple[NDArray[int], NDArray[int]]:
+        return find_hidden_singles(self.candidates, self.geometry, units)
+
+    def get_single_hidden_values(self) -> list[Cell]:
+        cells, values = self.find_hidden_singles()
+        return [Cell(*divmod(c, self.size), v) for c, v in zip(cells.tolist(), values.tolist())]
+
     def get_single_hidden_values_of_group(self, group: Group) -> list[Cell]:
-        if isinstance(group, Row):
-            coords = self.coord_array[group.index].reshape(self.size)
-        elif isinstance(group, Col):
-            coords = self.coord_array.transpose()[group.index].reshape(self.size)
-        elif isinstance(group, Square):
-            coords = self.coord_array_squares[group.index].reshape(self.size)
-        else:
-            raise PuzzleException('unable to determine coordinates for group')
-
-        missing_group_values = self.get_missing_values_of_group(group)
-        group_cells = [self.get_cell(c[0], c[1]) for c in coords]
-        empty_group_cells = [c for c in group_cells if c.value == 0]
-        cells_with_possible_values = list(zip(
-            empty_group_cells,
-            [self._get_possible_cell_values_from_group_intersection(c) for c in empty_group_cells]
-        ))
-        cells_with_hidden_values: list[Cell] = []
-        for v in missing_group_values:
-            cells_with_v = [cell for cell, values in cells_with_possible_values if v in values]
-            if len(cells_with_v) == 1:
-                cells_with_hidden_values.append(evolve(cells_with_v[0], value=v))
-        return cells_with_hidden_values
+        cells, values = self.find_hidden_singles(np.array([self.get_unit_index(group)]))
+        return [Cell(*divmod(c, self.size), v) for c, v in zip(cells.tolist(), values.tolist())]
 
     def _get_possible_cell_values_from_group_intersection(self, cell: Cell) -> NDArray:
         if cell.value != 0:
             return np.array([cell.value])
 
-        row = self.get_row_from_cell(cell)
-        col = self.get_col_from_cell(cell)
-        square = self.get_square_from_cell(cell)
-        row_col = np.union1d(row.array, col.array)
-        row_col_square = np.union1d(row_col, square.array)
-        missing_values = self.get_missing_values_of_group(row_col_square)
+        peers = self.geometry.peers[cell.row * self.size + cell.col]
+        missing_values = self.get_missing_values_of_group(self.get_cells(peers))
         if len(missing_values) == 0:
             raise PuzzleException('cell has no possible values')
         return missing_values
@@ -184,6 +230,9 @@ class SudokuPuzzle:
     def get_empty_cell_coords(self) -> NDArray[NDArray[int]]:
         return self.coord_array[self.board == 0]
 
+    def get_empty_cell_indices(self) -> NDArray[int]:
+        return np.flatnonzero(self.board == 0)
+
     @property
     def num_empty_cells(self) -> int:
         return self.board[self.board == 0].size
@@ -202,6 +251,32 @@ class SudokuPuzzle:
             rows = [row.array for row in rows]
         return cls(rows)
 
+    @classmethod
+    def from_string(cls, text: str, geometry: Geometry = None) -> 'SudokuPuzzle':
+        """one character per cell in row order. '0' or '.' are empty, values above 9 are letters"""
+        text = ''.join(text.split()).upper()
+        size = isqrt(len(text))
+        if size * size != len(text):
+            raise PuzzleException(f'puzzle string of length {len(text)} is not square')
+        try:
+            values = [0 if c in EMPTY_CELL_CHARS else CELL_CHARS.index(c) for c in text]
+        except ValueError:
+            raise PuzzleException(f'puzzle string contains invalid characters: {text}')
+        if max(values, default=0) > size:
+            raise PuzzleException(f'puzzle string has a value above {size}: {CELL_CHARS[max(values)]}')
+        return cls(np.array(values).reshape(size, size), geometry)
+
+    def to_string(self) -> str:
+        return ''.join(CELL_CHARS[v] for v in self.board.ravel())
+
+    @classmethod
+    def from_bytes(cls, data: bytes, size: int = None, geometry: Geometry = None) -> 'SudokuPuzzle':
+        return cls(unpack_board(data, size), geometry)
+
+    def to_bytes(self) -> bytes:
+        """the board bit packed. 41 bytes for a 9x9 board"""
+        return pack_board(self.board)
+
     @classmethod
     def from_squares(cls, squares: list[Square | NDArray[NDArray[int]]]) -> 'SudokuPuzzle':
         if isinstance(squares[0], Square):
@@ -217,16 +292,5 @@ class SudokuPuzzle:
 
     @property
     def is_solved(self):
-        board = self.board
-        if len(board[board == 0]) > 0:
-            return False
-        for row in self.rows:
-            if len(np.setdiff1d(self.value_range, row.array)) != 0:
-                return False
-        for col in self.cols:
-            if len(np.setdiff1d(self.value_range, col.array)) != 0:
-                return False
-        for sq in self.squares:
-            if len(np.setdiff1d(self.value_range, sq.array.ravel())) != 0:
-                return False
-        return True
+        unit_values = np.sort(self.board.ravel()[self.geometry.units], axis=1)
+        return bool((unit_values == self.value_range).all())
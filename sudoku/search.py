@@ -0,0 +1,251 @@
+from collections import deque
+from time import time
+from typing import Iterator
+
+import numpy as np
+from attrs import define
+from numpy.typing import NDArray
+
+from sudoku.geometry import Geometry
+from sudoku.candidates import make_candidates
+from sudoku.propagation import (ContradictionException, Propagator, check_board, fill_singles_batch,
+                                place_singles_batch)
+
+
+SEARCH = 'search'
+
+
+class SearchLimitException(Exception):
+    pass
+
+
+@define
+class SearchStats:
+    nodes: int = 0
+    backtracks: int = 0
+    max_depth: int = 0
+
+
+def choose_cell(propagator: Propagator) -> int:
+    """the empty cell with the fewest candidates"""
+    counts = propagator.candidates.sum(1)
+    counts[propagator.board != 0] = propagator.size + 1
+    return int(counts.argmin())
+
+
+def iter_branches(propagator: Propagator, rng: 'np.random.Generator' = None, depth: int = 0) -> Iterator[Propagator]:
+    """propagated copies of the board for each candidate of the most constrained cell"""
+    cell = choose_cell(propagator)
+    values = np.flatnonzero(propagator.candidates[cell]) + 1
+    if rng is not None:
+        rng.shuffle(values)
+    observer = propagator.observer
+    for value in values.tolist():
+        if observer is not None:
+            observer.on_branch(cell, value, depth)
+        branch = propagator.copy()
+        try:
+            branch.place(cell, value, SEARCH)
+            branch.propagate()
+        except ContradictionException:
+            if observer is not None:
+                observer.on_backtrack(depth)
+            continue
+        yield branch
+
+
+def search(propagator: Propagator, stats: SearchStats = None, depth: int = 0,
+           rng: 'np.random.Generator' = None, node_limit: int = None, deadline: float = None) -> Propagator | None:
+    """
+    depth first search. returns the solved board or None if there is no solution
+
+    Raises:
+        SearchLimitException: if more than node_limit nodes are visited or the deadline passes
+    """
+    if stats is None:
+        stats = SearchStats()
+    stats.nodes += 1
+    stats.max_depth = max(stats.max_depth, depth)
+    if node_limit is not None and stats.nodes > node_limit:
+        raise SearchLimitException(f'node limit of {node_limit} reached')
+    if deadline is not None and time() > deadline:
+        raise SearchLimitException('search deadline passed')
+
+    if propagator.is_solved:
+        return propagator
+    observer = propagator.observer
+    for branch in iter_branches(propagator, rng, depth):
+        try:
+            solved = search(branch, stats, depth + 1, rng, node_limit, deadline)
+        except SearchLimitException:
+            if observer is not None:
+                observer.on_backtrack(depth)
+            raise
+        if solved is not None:
+            if observer is not None:
+                observer.on_solution(depth)
+            return solved
+        if observer is not None:
+            observer.on_backtrack(depth)
+    stats.backtracks += 1
+    return None
+
+
+@define
+class SearchScratch:
+    """
+    preallocated board and candidate buffers, one level per search depth, so that a search
+    copies state between levels instead of allocating new arrays for every branch
+    """
+    boards: NDArray[int]
+    candidates: NDArray[bool]
+    queued: NDArray[bool]
+
+    @classmethod
+    def for_geometry(cls, geometry: Geometry) -> 'SearchScratch':
+        levels = geometry.num_cells + 1
+        return cls(np.zeros((levels, geometry.num_cells), dtype=int),
+                   np.zeros((levels, geometry.num_cells, geometry.size), dtype=bool),
+                   np.zeros((levels, geometry.num_units), dtype=bool))
+
+    def load(self, propagator: Propagator, level: int) -> Propagator:
+        """a propagator over the buffers of level holding a copy of propagator's state"""
+        np.copyto(self.boards[level], propagator.board)
+        np.copyto(self.candidates[level], propagator.candidates)
+        np.copyto(self.queued[level], propagator.queued)
+        return Propagator(propagator.geometry, self.boards[level], self.candidates[level],
+                          deque(propagator.queue), self.queued[level], propagator.observer)
+
+    def load_board(self, board: NDArray[int], geometry: Geometry) -> Propagator:
+        """
+        a propagator over the buffers of level 0 for a new board, like Propagator.from_board
+        but without allocating a board or candidates
+
+        Raises:
+            PuzzleException: if a value is outside 0 to size
+            ContradictionException: if a value is repeated in a unit
+        """
+        flat = self.boards[0]
+        np.copyto(flat, np.asarray(board).reshape(geometry.num_cells), casting='unsafe')
+        check_board(flat, geometry)
+        make_candidates(flat, geometry, out=self.candidates[0])
+        self.queued[0] = False
+        propagator = Propagator(geometry, flat, self.candidates[0], queued=self.queued[0])
+        propagator.enqueue(np.arange(geometry.num_units))
+        return propagator
+
+
+def search_in_scratch(propagator: Propagator, scratch: SearchScratch, stats: SearchStats = None,
+                      depth: int = 0, node_limit: int = None, deadline: float = None) -> Propagator | None:
+    """
+    depth first search using the buffers of scratch. the solved propagator is a view of the
+    scratch buffers, so copy the board out before the scratch is reused
+
+    Raises:
+        SearchLimitException: if more than node_limit nodes are visited or the deadline passes
+    """
+    if stats is None:
+        stats = SearchStats()
+    stats.nodes += 1
+    stats.max_depth = max(stats.max_depth, depth)
+    if node_limit is not None and stats.nodes > node_limit:
+        raise SearchLimitException(f'node limit of {node_limit} reached')
+    if deadline is not None and time() > deadline:
+        raise SearchLimitException('search deadline passed')
+
+    if propagator.is_solved:
+        return propagator
+    cell = choose_cell(propagator)
+    for value in (np.flatnonzero(propagator.candidates[cell]) + 1).tolist():
+        branch = scratch.load(propagator, depth + 1)
+        try:
+            branch.place(cell, value, SEARCH)
+            branch.propagate()
+        except ContradictionException:
+            continue
+        solved = search_in_scratch(branch, scratch, stats, depth + 1, node_limit, deadline)
+        if solved is not None:
+            return solved
+    stats.backtracks += 1
+    return None
+
+
+def search_batched(propagator: Propagator, stats: SearchStats = None, depth: int = 0) -> Propagator | None:
+    """
+    depth first search that places every value of the chosen cell at once and fills the
+    singles of all the branches together with fill_singles_batch. visits the same nodes as
+    search but sends no events to the observer
+    """
+    if stats is None:
+        stats = SearchStats()
+    stats.nodes += 1
+    stats.max_depth = max(stats.max_depth, depth)
+
+    if propagator.is_solved:
+        return propagator
+    geometry = propagator.geometry
+    cell = choose_cell(propagator)
+    value_idx = np.flatnonzero(propagator.candidates[cell])
+    boards = np.repeat(propagator.board[None], len(value_idx), axis=0)
+    candidates = np.repeat(propagator.candidates[None], len(value_idx), axis=0)
+    singles = np.zeros_like(candidates)
+    singles[np.arange(len(value_idx)), cell, value_idx] = True
+    failed = place_singles_batch(boards, candidates, singles, geometry)
+    failed |= fill_singles_batch(boards, candidates, geometry)[1]
+
+    for board, branch_candidates in zip(boards[~failed], candidates[~failed]):
+        solved = search_batched(Propagator(geometry, board, branch_candidates), stats, depth + 1)
+        if solved is not None:
+            return solved
+    stats.backtracks += 1
+    return None
+
+
+def count_solutions(propagator: Propagator, limit: int = None, stats: SearchStats = None, depth: int = 0) -> int:
+    """count solutions, stopping once limit is reached"""
+    if stats is None:
+        stats = SearchStats()
+    stats.nodes += 1
+    stats.max_depth = max(stats.max_depth, depth)
+
+    if propagator.is_solved:
+        return 1
+    count = 0
+    for branch in iter_branches(propagator, depth=depth):
+        count += count_solutions(branch, None if limit is None else limit - count, stats, depth + 1)
+        if propagator.observer is not None:
+            propagator.observer.on_backtrack(depth)
+        if limit is not None and count >= limit:
+            break
+    return count
+
+
+def luby(i: int) -> int:
+    """the i-th term (1 based) of the luby restart sequence 1, 1, 2, 1, 1, 2, 4, ..."""
+    k = 1
+    while (1 << k) - 1 < i:
+        k += 1
+    if (1 << k) - 1 == i:
+        return 1 << (k - 1)
+    return luby(i - (1 << (k - 1)) + 1)
+
+
+def search_with_restarts(propagator: Propagator, seed: int = None, base_nodes: int = 32,
+                         stats: SearchStats = None) -> Propagator | None:
+    """randomised value ordering, restarted with luby scaled node limits"""
+    if stats is None:
+        stats = SearchStats()
+    rng = np.random.default_rng(seed)
+    restart = 1
+    while True:
+        run_stats = SearchStats()
+        try:
+            solved = search(propagator, run_stats, rng=rng, node_limit=base_nodes * luby(restart))
+        except SearchLimitException:
+            restart += 1
+            continue
+        finally:
+            stats.nodes += run_stats.nodes
+            stats.backtracks += run_stats.backtracks
+            stats.max_depth = max(stats.max_depth, run_stats.max_depth)
+        return solved
@@ -0,0 +1,115 @@
+from attrs import define, field, frozen
+
+from sudoku.grader import STRATEGIES
+from sudoku.propagation import HIDDEN_SINGLE, ContradictionException, Propagator
+from sudoku.puzzle import Board, SudokuPuzzle
+
+
+@frozen
+class Hint:
+    row: int
+    col: int
+    value: int
+    technique: str
+    units: tuple[int, ...]
+
+
+def find_queued_hint(propagator: Propagator) -> tuple[int, int, str, tuple[int, ...]] | None:
+    """
+    check queued units until one has a single. units without singles leave the queue, the unit
+    with the single is kept at the front since the single is not placed
+    """
+    while propagator.queue:
+        unit = propagator.queue[0]
+        singles = propagator.find_unit_singles(unit)
+        if singles:
+            cell, value, strategy = singles[0]
+            units = (int(unit),) if strategy == HIDDEN_SINGLE else tuple(propagator.geometry.cell_units[cell].tolist())
+            return int(cell), int(value), strategy, units
+        propagator.queue.popleft()
+        propagator.queued[unit] = False
+    return None
+
+
+@define
+class HintSession:
+    """
+    keeps the candidates of a board between edits so that each hint only checks the units
+    changed since the last one
+    """
+    propagator: Propagator
+    hint: Hint | None = field(default=None, init=False)
+    # why the board has no solution, found by the last call to next_hint
+    contradiction: str | None = field(default=None, init=False)
+
+    @classmethod
+    def from_puzzle(cls, puzzle: SudokuPuzzle | Board) -> 'HintSession':
+        if isinstance(puzzle, SudokuPuzzle):
+            return cls(Propagator.from_board(puzzle.board, puzzle.geometry))
+        return cls(Propagator.from_board(puzzle))
+
+    @property
+    def board(self):
+        return self.propagator.to_board()
+
+    def set_cell(self, row: int, col: int, value: int):
+        """
+        Raises:
+            ContradictionException: if the value is already in one of the cell's units
+        """
+        cell = row * self.propagator.size + col
+        if self.propagator.board[cell] == value:
+            return
+        # check before clearing so that a rejected edit leaves the old value in place
+        if value != 0 and (self.propagator.board[self.propagator.geometry.peers[cell]] == value).any():
+            raise ContradictionException(f'{value} is already in a unit of cell {(row, col)}')
+        self.hint = None
+        self.contradiction = None
+        self.propagator.clear(cell)
+        if value != 0:
+            self.propagator.place(cell, value)
+
+    def next_hint(self) -> Hint | None:
+        """
+        the next single, found with the least powerful technique that leads to one. returns None
+        when stuck, or when an earlier edit left the board without a solution, in which case
+        contradiction says why
+        """
+        if self.hint is not None:
+            return self.hint
+        try:
+            return self._find_hint()
+        except ContradictionException as e:
+            self.contradiction = str(e)
+            return None
+
+    def _find_hint(self) -> Hint | None:
+        found = find_queued_hint(self.propagator)
+        technique = None
+        # eliminate on a copy so that the session keeps only the candidates of the board
+        propagator = self.propagator.copy() if found is None else None
+        while found is None:
+            for i, (name, strategy) in enumerate(STRATEGIES):
+                if strategy(propagator):
+                    technique = name if technique is None else STRATEGIES[max(i, self._rank(technique))][0]
+                    found = find_queued_hint(propagator)
+                    break
+            else:
+                return None
+
+        cell, value, strategy, units = found
+        self.hint = Hint(*divmod(cell, self.propagator.size), value, technique or strategy, units)
+        return self.hint
+
+    @staticmethod
+    def _rank(technique: str) -> int:
+        return [name for name, _ in STRATEGIES].index(technique)
+
+    def apply_hint(self) -> Hint | None:
+        hint = self.next_hint()
+        if hint is not None:
+            self.set_cell(hint.row, hint.col, hint.value)
+        return hint
+
+    def unit_labels(self, hint: Hint) -> tuple[str, ...]:
+        return tuple(self.propagator.geometry.labels[u] for u in hint.units)
@@ -1,16 +1,25 @@
 import logging
+from collections import deque
 from copy import deepcopy
 from time import time
+from typing import TYPE_CHECKING, Iterator
 
 import numpy as np
-from attrs import define, field
+from attrs import define, field, frozen
 from numpy.typing import NDArray
 
-from sudoku.puzzle import Board, Cell, SudokuPuzzle
+from sudoku.puzzle import Board, PuzzleException, SudokuPuzzle
 from sudoku.groups import Group
+from sudoku.propagation import ContradictionException, Propagator
+from sudoku.search import SEARCH, SearchLimitException, search
+from sudoku.templates import eliminate_templates
 from sudoku.validators import is_square_array, is_valid_group_shape
 from sudoku.validators.group_validators import is_col, is_row
 
+if TYPE_CHECKING:
+    from sudoku.observers import SolverObserver
+    from sudoku.store import SolutionStore
+
 logger = logging.getLogger(__name__)
 
 def solve_simple_board(board: SudokuPuzzle):
@@ -56,10 +65,26 @@ def convert_to_puzzle(puzzle: SudokuPuzzle | Board) -> SudokuPuzzle:
         return SudokuPuzzle(puzzle)
 
 
+STORE = 'store'
+
+
+@frozen
+class ProgressEvent:
+    row: int
+    col: int
+    value: int
+    strategy: str
+    elapsed: float
+    num_empty_cells: int
+
+
 @define
 class SudokuSolver:
     puzzle: SudokuPuzzle = field(converter=convert_to_puzzle, repr=lambda p: f'\n{repr(p.board)}\nsolved={p.is_solved}')
     timeout: int = field(default=10, eq=False, repr=False)
+    use_search: bool = field(default=True, eq=False, repr=False)
+    store: 'SolutionStore | None' = field(default=None, eq=False, repr=False)
+    observer: 'SolverObserver | None' = field(default=None, eq=False, repr=False)
 
     @property
     def is_solved(self):
@@ -70,57 +95,86 @@ class SudokuSolver:
         return self.puzzle.num_empty_cells
 
     def solve_hidden_values_single(self):
-        for row in self.puzzle.rows:
-            cells_with_hidden_values = self.puzzle.get_single_hidden_values_of_group(row)
-            for cell in cells_with_hidden_values:
-                self.puzzle.put_cell(cell)
-
-        for col in self.puzzle.cols:
-            cells_with_hidden_values = self.puzzle.get_single_hidden_values_of_group(col)
-            for cell in cells_with_hidden_values:
-                self.puzzle.put_cell(cell)
-
-        for sq in self.puzzle.squares:
-            cells_with_hidden_values = self.puzzle.get_single_hidden_values_of_group(sq)
-            for cell in cells_with_hidden_values:
-                self.puzzle.put_cell(cell)
+        cells, values = self.puzzle.find_hidden_singles()
+        self.puzzle.put_cells(cells, values)
 
     def solve_groups_with_one_missing(self):
-        original_puzzle = self.puzzle
-        potentially_solved_puzzle = solve_simple_board(original_puzzle)
-        logger.debug(f'{original_puzzle=}')
-        logger.debug(f'{potentially_solved_puzzle=}')
-
-        while original_puzzle != potentially_solved_puzzle:
-            original_puzzle = potentially_solved_puzzle
-            potentially_solved_puzzle = solve_simple_board(original_puzzle)
-            logger.debug(f'{original_puzzle=}')
-            logger.debug(f'{potentially_solved_puzzle=}')
-
-        self.puzzle = potentially_solved_puzzle
+        """fill the last empty cell of every unit until no unit has exactly one empty cell"""
+        units = self.puzzle.geometry.units
+        while True:
+            unit_values = self.puzzle.get_cells(units)
+            one_missing = (unit_values == 0).sum(axis=1) == 1
+            if not one_missing.any():
+                break
+            unit_values = unit_values[one_missing]
+            present = np.zeros((len(unit_values), self.puzzle.size + 1), dtype=bool)
+            np.put_along_axis(present, unit_values, True, axis=1)
+            self.puzzle.put_cells(units[one_missing][unit_values == 0], present[:, 1:].argmin(axis=1) + 1)
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug(f'{self.puzzle=}')
 
     def solve_cells_with_one_possibility(self):
-        for coord in self.puzzle.get_empty_cell_coords():
-            cell = Cell(coord[0], coord[1], 0)
-            possible_cell_values = self.puzzle.get_possible_cell_values(cell)
-            if possible_cell_values.size == 1:
-                self.puzzle.put_cell(cell, possible_cell_values[0])
+        empty = self.puzzle.get_empty_cell_indices()
+        candidates = self.puzzle.candidates[empty]
+        num_candidates = candidates.sum(1)
+        if (num_candidates == 0).any():
+            raise PuzzleException('cell has no possible values')
+        single = num_candidates == 1
+        self.puzzle.put_cells(empty[single], candidates[single].argmax(1) + 1)
+
+    def solve_with_templates(self):
+        propagator = Propagator.from_board(self.puzzle.board, self.puzzle.geometry)
+        eliminate_templates(propagator)
+        np.copyto(self.puzzle.board, propagator.to_board())
 
     def solve(self):
-        timer = time()
-        num_empty_cells_prev = 0
-        num_empty_cells_current = self.num_empty_cells
-
-        while ((num_empty_cells_prev != num_empty_cells_current)
-               and (time() - timer < self.timeout)
-               and (self.is_solved is False)):
-            num_empty_cells_prev = num_empty_cells_current
-
-            self.solve_groups_with_one_missing()
-            self.solve_hidden_values_single()
-            self.solve_cells_with_one_possibility()
+        deque(self.solve_iter(), maxlen=0)
+        return self
 
-            num_empty_cells_current = self.num_empty_cells
+    def solve_iter(self) -> Iterator[ProgressEvent]:
+        """
+        solve, yielding an event for each cell as it is filled. cells are written to the puzzle as
+        they are found, so the partial board is available if iteration is stopped early
+        """
+        timer = time()
+        board = self.puzzle.board.copy()
+        size = self.puzzle.size
+        # stored solutions are keyed by the board alone, so only classic puzzles use the store
+        store = self.store if self.puzzle.geometry.is_classic else None
+        if store is not None:
+            solution = store.get(board)
+            if solution is not None:
+                yield from self._fill(np.flatnonzero(board != solution), solution.ravel(), STORE, timer)
+                return
+
+        propagator = Propagator.from_board(board, self.puzzle.geometry, observer=self.observer)
+        num_empty_cells = propagator.num_empty_cells
+        for cell, value, strategy in propagator.iter_propagate(timeout=self.timeout):
+            row, col = divmod(int(cell), size)
+            self.puzzle.board[row, col] = value
+            num_empty_cells -= 1
+            yield ProgressEvent(row, col, int(value), strategy, time() - timer, num_empty_cells)
+
+        if self.use_search and not propagator.is_solved:
+            try:
+                solved = search(propagator, deadline=timer + self.timeout)
+            except SearchLimitException:
+                logger.info(f'search timed out after {self.timeout}s')
+            else:
+                if solved is None:
+                    raise ContradictionException('puzzle has no solution')
+                yield from self._fill(np.flatnonzero(propagator.board != solved.board), solved.board, SEARCH, timer)
+
+        if store is not None and self.is_solved:
+            store.put(board, self.puzzle.board)
+        if logger.isEnabledFor(logging.INFO):
             logger.info(f'board: {self.puzzle.board}')
             logger.info(f'empty cells: {self.num_empty_cells}')
-        return self
+
+    def _fill(self, cells: NDArray[int], values: NDArray[int], strategy: str, timer: float) -> Iterator[ProgressEvent]:
+        num_empty_cells = self.num_empty_cells
+        for cell in cells.tolist():
+            row, col = divmod(cell, self.puzzle.size)
+            self.puzzle.board[row, col] = values[cell]
+            num_empty_cells -= 1
+            yield ProgressEvent(row, col, int(values[cell]), strategy, time() - timer, num_empty_cells)
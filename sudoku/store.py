@@ -0,0 +1,110 @@
+import sqlite3
+from hashlib import blake2b
+from itertools import islice
+from pathlib import Path
+from time import time
+from typing import Iterable, Sequence
+
+import numpy as np
+from attrs import define, field
+from numpy.typing import NDArray
+
+from sudoku.encoding import pack_board, unpack_board
+from sudoku.puzzle import Board, SudokuPuzzle
+
+# keep well under sqlite's limit on bound parameters per statement
+MAX_QUERY_PARAMS = 500
+
+
+def board_key(board: Board | SudokuPuzzle) -> bytes:
+    """16 byte hash of a board's size and bit packed values"""
+    board = np.asarray(board.board if isinstance(board, SudokuPuzzle) else board)
+    return blake2b(bytes([len(board)]) + pack_board(board), digest_size=16).digest()
+
+
+def iter_batches(items: Iterable, size: int = MAX_QUERY_PARAMS):
+    items = iter(items)
+    while batch := list(islice(items, size)):
+        yield batch
+
+
+@define
+class SolutionStore:
+    """
+    solutions keyed by a hash of the puzzle, stored in a sqlite file in WAL mode so that
+    worker processes can read while another process writes. open one store per process
+    """
+    path: Path = field(converter=Path)
+    timeout: float = 30
+    connection: sqlite3.Connection = field(init=False, repr=False)
+
+    def __attrs_post_init__(self):
+        self.connection = sqlite3.connect(self.path, timeout=self.timeout)
+        self.connection.execute('PRAGMA journal_mode=WAL')
+        self.connection.execute('PRAGMA synchronous=NORMAL')
+        self.connection.execute(
+            'CREATE TABLE IF NOT EXISTS solutions ('
+            'key BLOB PRIMARY KEY, size INTEGER NOT NULL, solution BLOB NOT NULL, created REAL NOT NULL)')
+        self.connection.commit()
+
+    def close(self):
+        self.connection.close()
+
+    def __enter__(self) -> 'SolutionStore':
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def __len__(self) -> int:
+        return self.connection.execute('SELECT COUNT(*) FROM solutions').fetchone()[0]
+
+    def __contains__(self, board: Board | SudokuPuzzle) -> bool:
+        return self.get(board) is not None
+
+    def get(self, board: Board | SudokuPuzzle) -> NDArray[int] | None:
+        return self.get_many([board])[0]
+
+    def put(self, board: Board | SudokuPuzzle, solution: Board | SudokuPuzzle):
+        self.put_many([(board, solution)])
+
+    def get_many(self, boards: Sequence[Board | SudokuPuzzle]) -> list[NDArray[int] | None]:
+        keys = [board_key(b) for b in boards]
+        found = {}
+        for batch in iter_batches(set(keys)):
+            rows = self.connection.execute(
+                f'SELECT key, size, solution FROM solutions WHERE key IN ({",".join("?" * len(batch))})', batch)
+            for key, size, solution in rows:
+                found[key] = unpack_board(solution, size)
+        return [found.get(key) for key in keys]
+
+    def put_many(self, pairs: Iterable[tuple[Board | SudokuPuzzle, Board | SudokuPuzzle]]):
+        now = time()
+        rows = []
+        for board, solution in pairs:
+            solution = np.asarray(solution.board if isinstance(solution, SudokuPuzzle) else solution)
+            rows.append((board_key(board), len(solution), pack_board(solution), now))
+        with self.connection:
+            self.connection.executemany('INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?)', rows)
+
+    @property
+    def size_bytes(self) -> int:
+        """bytes used by the database, not counting free pages"""
+        page_count = self.connection.execute('PRAGMA page_count').fetchone()[0]
+        free_pages = self.connection.execute('PRAGMA freelist_count').fetchone()[0]
+        page_size = self.connection.execute('PRAGMA page_size').fetchone()[0]
+        return (page_count - free_pages) * page_size
+
+    def prune(self, max_bytes: int, vacuum: bool = False) -> int:
+        """delete the oldest solutions until the database uses at most max_bytes. returns the number deleted"""
+        removed = 0
+        while self.size_bytes > max_bytes and (count := len(self)) > 0:
+            batch = max(1, count // 10)
+            with self.connection:
+                self.connection.execute(
+                    'DELETE FROM solutions WHERE rowid IN (SELECT rowid FROM solutions ORDER BY rowid LIMIT ?)',
+                    (batch,))
+            removed += batch
+        if vacuum:
+            self.connection.execute('VACUUM')
+        return removed
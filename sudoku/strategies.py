@@ -0,0 +1,110 @@
+from itertools import combinations
+
+import numpy as np
+from numpy.typing import NDArray
+
+from sudoku.propagation import Propagator
+
+
+def to_bitmasks(arr: NDArray[bool]) -> list[int]:
+    """pack the last axis of a boolean array into python ints, as nested lists"""
+    weights = 1 << np.arange(arr.shape[-1], dtype=np.int64)
+    return (arr @ weights).tolist()
+
+
+def iter_bits(mask: int):
+    while mask:
+        low = mask & -mask
+        yield low.bit_length() - 1
+        mask ^= low
+
+
+def find_subset(masks: list[int], k: int) -> tuple[tuple[int, ...], int] | None:
+    """
+    find k masks whose union has exactly k bits and which leave bits to remove from the others
+
+    Returns:
+        the indices of the masks and their union, or None
+    """
+    candidates = [i for i, m in enumerate(masks) if 0 < m.bit_count() <= k]
+    for combo in combinations(candidates, k):
+        union = 0
+        for i in combo:
+            union |= masks[i]
+        if union.bit_count() != k:
+            continue
+        if any(masks[i] & union for i in range(len(masks)) if i not in combo):
+            return combo, union
+    return None
+
+
+def eliminate_locked_candidates(propagator: Propagator) -> bool:
+    """pointing and claiming: a value confined to the intersection of two units is removed from the rest of both"""
+    geometry = propagator.geometry
+    if geometry.intersections.size == 0:
+        return False
+    candidates = propagator.candidates.astype(np.uint8)
+    unit_counts = geometry.membership.T.astype(np.uint8) @ candidates
+    inter_counts = geometry.intersection_cells @ candidates
+    a, b = geometry.intersections.T
+
+    locked = (inter_counts > 0) & (unit_counts[a] == inter_counts) & (unit_counts[b] > inter_counts)
+    progress = False
+    for pair, value in zip(*np.nonzero(locked)):
+        cells = geometry.units[b[pair]]
+        cells = cells[geometry.intersection_cells[pair, cells] == 0]
+        for cell in cells[propagator.candidates[cells, value]]:
+            propagator.eliminate(cell, value + 1)
+            progress = True
+    return progress
+
+
+def eliminate_subsets(propagator: Propagator, max_size: int = 4) -> bool:
+    """naked and hidden pairs, triples and quads"""
+    units = propagator.geometry.units
+    unit_candidates = propagator.candidates[units]
+    # bitmasks of every unit at once, by cell (naked) and by value (hidden)
+    cell_masks = to_bitmasks(unit_candidates)
+    value_masks = to_bitmasks(unit_candidates.transpose(0, 2, 1))
+    num_empty = (propagator.board[units] == 0).sum(axis=1).tolist()
+    for k in range(2, max_size + 1):
+        for u, unit in enumerate(units):
+            if num_empty[u] <= k:
+                continue
+
+            naked = find_subset(cell_masks[u], k)
+            if naked is not None:
+                positions, values = naked
+                for i in set(range(unit.size)) - set(positions):
+                    for value in iter_bits(values):
+                        propagator.eliminate(unit[i], value + 1)
+                return True
+
+            hidden = find_subset(value_masks[u], k)
+            if hidden is not None:
+                values, positions = hidden
+                for i in iter_bits(positions):
+                    for value in set(range(propagator.size)) - set(values):
+                        propagator.eliminate(unit[i], value + 1)
+                return True
+    return False
+
+
+def eliminate_fish(propagator: Propagator, max_size: int = 4) -> bool:
+    """x-wing, swordfish and jellyfish on rows and columns"""
+    size = propagator.size
+    value_candidates = propagator.candidates.reshape(size, size, size).transpose(2, 0, 1)  # (values, rows, cols)
+    line_masks = (to_bitmasks(value_candidates), to_bitmasks(value_candidates.transpose(0, 2, 1)))
+    for k in range(2, max_size + 1):
+        for value in range(size):
+            for transposed in (False, True):
+                fish = find_subset(line_masks[transposed][value], k)
+                if fish is None:
+                    continue
+                base_lines, cover_lines = fish
+                for line in set(range(size)) - set(base_lines):
+                    for other in iter_bits(cover_lines):
+                        row, col = (other, line) if transposed else (line, other)
+                        propagator.eliminate(row * size + col, value + 1)
+                return True
+    return False
@@ -0,0 +1,121 @@
+from functools import lru_cache
+
+import numpy as np
+from attrs import frozen
+from numpy.typing import NDArray
+
+from sudoku.geometry import Geometry, cached_geometry
+from sudoku.propagation import ContradictionException, Propagator
+
+TEMPLATES = 'templates'
+
+# 16x16 boards have far too many templates to enumerate
+MAX_TEMPLATE_SIZE = 9
+
+
+@frozen
+class DigitTemplates:
+    """
+    every placement of a single value that fills each unit once. cells holds the flat cell
+    index chosen in each row, and bits holds the same cells as a (words, templates) bit set
+    for filtering. about 1.6 MB together for a classic 9x9 board
+    """
+    cells: NDArray[np.uint16]
+    bits: NDArray[np.uint64]
+
+    def __len__(self) -> int:
+        return len(self.cells)
+
+
+def make_templates(geometry: Geometry) -> DigitTemplates:
+    """
+    the templates of a geometry. those of the cached geometries are kept for good, and those of
+    other geometries (such as jigsaw) are kept for the two most recent sets of units
+    """
+    if geometry.kind is not None:
+        return _kind_templates(geometry.kind, geometry.size)
+    return _unit_templates(geometry.size, geometry.units.astype(np.int64).tobytes())
+
+
+@lru_cache(maxsize=None)
+def _kind_templates(kind: str, size: int) -> DigitTemplates:
+    return enumerate_templates(cached_geometry(kind, size))
+
+
+@lru_cache(maxsize=2)
+def _unit_templates(size: int, units: bytes) -> DigitTemplates:
+    return enumerate_templates(Geometry(size, np.frombuffer(units, dtype=np.int64).reshape(-1, size)))
+
+
+def enumerate_templates(geometry: Geometry) -> DigitTemplates:
+    """
+    enumerate the templates of a geometry one row at a time (46,656 for a classic 9x9 board),
+    keeping those that cover every unit. expects the rows to be the first units of the geometry
+    """
+    cells = np.zeros((1, 0), dtype=np.uint16)
+    used_units = np.zeros((1, geometry.num_units), dtype=bool)
+    for row in geometry.units[:geometry.size]:
+        extended_cells, extended_units = [], []
+        for cell in row:
+            free = ~(used_units & geometry.membership[cell]).any(axis=1)
+            extended_cells.append(np.hstack([cells[free], np.full((free.sum(), 1), cell, dtype=np.uint16)]))
+            extended_units.append(used_units[free] | geometry.membership[cell])
+        cells, used_units = np.vstack(extended_cells), np.vstack(extended_units)
+    # one cell per row never reuses a unit, but units beyond rows, cols and squares can be missed
+    cells = cells[used_units.all(axis=1)]
+
+    covered = np.zeros((len(cells), geometry.num_cells), dtype=bool)
+    covered[np.arange(len(cells))[:, None], cells] = True
+    return DigitTemplates(cells, np.ascontiguousarray(pack_cells(covered).T))
+
+
+def pack_cells(mask: NDArray[bool]) -> NDArray[np.uint64]:
+    """pack the last axis of a mask over cells into 64 bit words, 64 cells per word"""
+    num_words = -(-mask.shape[-1] // 64)
+    padded = np.zeros(mask.shape[:-1] + (num_words * 64,), dtype=bool)
+    padded[..., :mask.shape[-1]] = mask
+    return np.packbits(padded, axis=-1, bitorder='little').view(np.uint64)
+
+
+def filter_templates(templates: DigitTemplates, board: NDArray[int], candidates: NDArray[bool]) -> NDArray[bool]:
+    """
+    which templates each value can still use: those that only cover cells where the value is
+    given or a candidate. shape (templates, size)
+    """
+    allowed = candidates.copy()
+    filled = np.flatnonzero(board)
+    allowed[filled, board[filled] - 1] = True
+    forbidden = pack_cells(~allowed.T)  # (values, words)
+    hits = np.zeros((len(templates), len(forbidden)), dtype=np.uint64)
+    for template_word, value_words in zip(templates.bits, forbidden.T):
+        hits |= template_word[:, None] & value_words
+    return hits == 0
+
+
+def eliminate_templates(propagator: Propagator) -> bool:
+    """
+    remove each value from the cells that none of its surviving templates cover, and place it
+    in empty cells that all of them cover
+
+    Raises:
+        ContradictionException: if a value has no template left
+    """
+    if propagator.size > MAX_TEMPLATE_SIZE:
+        return False
+    templates = make_templates(propagator.geometry)
+    survivors = filter_templates(templates, propagator.board, propagator.candidates)
+    counts = survivors.sum(axis=0)
+    if (counts == 0).any():
+        raise ContradictionException(f'no templates left for value {np.argmin(counts) + 1}')
+    # how many surviving templates of each value cover each cell, shape (cells, values)
+    num_cells = propagator.geometry.num_cells
+    coverage = np.stack([np.bincount(templates.cells[s].ravel(), minlength=num_cells) for s in survivors.T], axis=1)
+
+    progress = False
+    for cell, value in zip(*np.nonzero(propagator.candidates & (coverage == 0))):
+        propagator.eliminate(cell, value + 1)
+        progress = True
+    empty = propagator.board == 0
+    for cell, value in zip(*np.nonzero(empty[:, None] & (coverage == counts))):
+        progress |= propagator.place(cell, value + 1, TEMPLATES)
+    return progress
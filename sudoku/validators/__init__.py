@@ -1,3 +1,34 @@
-from .board_validators import is_valid_board_size
-from .group_validators import is_complete_group, is_valid_group_shape
-from .array_validators import is_square_array, is_1d_array
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# validator modules are imported on first use
+_EXPORTS = {
+    'is_valid_board_size': 'board_validators',
+    'is_complete_group': 'group_validators',
+    'is_valid_group_shape': 'group_validators',
+    'is_square_array': 'array_validators',
+    'is_1d_array': 'array_validators',
+    'validate_boards': 'batch_validators',
+    'BatchValidation': 'batch_validators',
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    if name not in _EXPORTS:
+        raise AttributeError(f'module {__name__!r} has no attribute {name!r}')
+    value = getattr(import_module(f'{__name__}.{_EXPORTS[name]}'), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+if TYPE_CHECKING:
+    from .board_validators import is_valid_board_size
+    from .group_validators import is_complete_group, is_valid_group_shape
+    from .array_validators import is_square_array, is_1d_array
+    from .batch_validators import validate_boards, BatchValidation
@@ -0,0 +1,85 @@
+from math import isqrt
+
+import numpy as np
+from attrs import define
+from numpy.typing import NDArray
+
+from .board_validators import is_valid_board_size
+
+
+def get_unit_values_batch(boards: NDArray[int]) -> NDArray[int]:
+    """the rows, cols and squares of each board, shape (N, 3 * size, size)"""
+    num_boards, size, _ = boards.shape
+    side = isqrt(size)
+    squares = boards.reshape(num_boards, side, side, side, side).transpose(0, 1, 3, 2, 4)
+    return np.concatenate([boards, boards.transpose(0, 2, 1), squares.reshape(num_boards, size, size)], axis=1)
+
+
+def is_valid_board_shape_batch(boards: NDArray[int]) -> bool:
+    return boards.ndim == 3 and boards.shape[1] == boards.shape[2] and is_valid_board_size(boards.shape[1])
+
+
+def is_valid_value_range_batch(boards: NDArray[int]) -> NDArray[bool]:
+    size = boards.shape[-1]
+    return ((boards >= 0) & (boards <= size)).all(axis=(1, 2))
+
+
+def has_unit_conflicts_batch(boards: NDArray[int]) -> NDArray[bool]:
+    """whether each unit of each board repeats a given. shape (N, 3 * size)"""
+    unit_values = np.sort(get_unit_values_batch(boards), axis=2)
+    repeated = (unit_values[..., 1:] == unit_values[..., :-1]) & (unit_values[..., 1:] != 0)
+    return repeated.any(axis=2)
+
+
+def is_complete_board_batch(boards: NDArray[int], conflicts: NDArray[bool] = None) -> NDArray[bool]:
+    if conflicts is None:
+        conflicts = has_unit_conflicts_batch(boards)
+    return (boards != 0).all(axis=(1, 2)) & is_valid_value_range_batch(boards) & ~conflicts.any(axis=1)
+
+
+@define
+class BatchValidation:
+    valid_shape: NDArray[bool]
+    valid_values: NDArray[bool]
+    unit_conflicts: NDArray[bool]
+    complete: NDArray[bool]
+
+    @property
+    def valid(self) -> NDArray[bool]:
+        """boards that can be given to the solver"""
+        return self.valid_shape & self.valid_values & ~self.unit_conflicts.any(axis=1)
+
+
+def validate_boards(boards: NDArray[int] | list) -> BatchValidation:
+    """
+    validate a batch of boards of shape (N, size, size). a list of boards with different
+    shapes is validated one group of equally shaped boards at a time
+
+    unit_conflicts has a column per row, col and square of the largest valid size in the batch.
+    a single board array of shape (size, size) is validated as a batch of one
+    """
+    if isinstance(boards, np.ndarray) and boards.ndim == 2:
+        boards = boards[None]
+    if isinstance(boards, np.ndarray) and boards.ndim == 3:
+        groups = {boards.shape[1:]: (np.arange(len(boards)), boards)}
+    else:
+        boards = [np.asarray(b) for b in boards]
+        shapes = {}
+        for i, board in enumerate(boards):
+            shapes.setdefault(board.shape, []).append(i)
+        groups = {shape: (np.array(idx), np.stack([boards[i] for i in idx])) for shape, idx in shapes.items()}
+
+    num_boards = len(boards)
+    num_units = max([3 * shape[0] for shape, (_, group) in groups.items() if is_valid_board_shape_batch(group)],
+                    default=0)
+    result = BatchValidation(np.zeros(num_boards, dtype=bool), np.zeros(num_boards, dtype=bool),
+                             np.zeros((num_boards, num_units), dtype=bool), np.zeros(num_boards, dtype=bool))
+    for shape, (idx, group) in groups.items():
+        if not is_valid_board_shape_batch(group):
+            continue
+        conflicts = has_unit_conflicts_batch(group)
+        result.valid_shape[idx] = True
+        result.valid_values[idx] = is_valid_value_range_batch(group)
+        result.unit_conflicts[idx, :conflicts.shape[1]] = conflicts
+        result.complete[idx] = is_complete_board_batch(group, conflicts)
+    return result
@@ -7,10 +7,7 @@ from .board_validators import is_valid_board_size
 
 def is_complete_group(group: np.ndarray):
     """validate that a grouping of numbers is properly filled"""
-    for i in range(1, group.size + 1):
-        if i not in group:
-            return False
-    return True
+    return bool(np.array_equal(np.sort(group, axis=None), np.arange(1, group.size + 1)))
 
 
 def is_valid_group_size(group: np.ndarray, size: int = None):
@@ -56,7 +56,7 @@ solution_3x3_easy = (
     [7,6,5, 8,9,4, 1,2,3],
     [9,4,2, 3,6,1, 5,8,7],
 
-    [2,3,3, 4,5,9, 7,1,8],
+    [2,3,6, 4,5,9, 7,1,8],
     [4,9,7, 2,1,8, 6,3,5],
     [1,5,8, 6,3,7, 2,9,4],
 )
@@ -74,6 +74,46 @@ puzzle_3x3_easy = (
     [0,0,0, 6,0,0, 2,0,0],
 )
 
+solution_3x3_hard = (
+    [8,1,2, 7,5,3, 6,4,9],
+    [9,4,3, 6,8,2, 1,7,5],
+    [6,7,5, 4,9,1, 2,8,3],
+
+    [1,5,4, 2,3,7, 8,9,6],
+    [3,6,9, 8,4,5, 7,2,1],
+    [2,8,7, 1,6,9, 5,3,4],
+
+    [5,2,1, 9,7,4, 3,6,8],
+    [4,3,8, 5,2,6, 9,1,7],
+    [7,9,6, 3,1,8, 4,5,2],
+)
+puzzle_3x3_hard = (
+    [8,0,0, 0,0,0, 0,0,0],
+    [0,0,3, 6,0,0, 0,0,0],
+    [0,7,0, 0,9,0, 2,0,0],
+
+    [0,5,0, 0,0,7, 0,0,0],
+    [0,0,0, 0,4,5, 7,0,0],
+    [0,0,0, 1,0,0, 0,3,0],
+
+    [0,0,1, 0,0,0, 0,6,8],
+    [0,0,8, 5,0,0, 0,1,0],
+    [0,9,0, 0,0,0, 4,0,0],
+)
+puzzle_3x3_fish = (
+    [1,0,0, 0,0,0, 5,6,9],
+    [4,9,2, 0,5,6, 1,0,8],
+    [0,5,6, 1,0,9, 2,4,0],
+
+    [0,0,9, 6,4,0, 8,0,1],
+    [0,6,4, 0,1,0, 0,0,0],
+    [2,1,8, 0,3,5, 6,0,4],
+
+    [0,4,0, 5,0,0, 0,1,6],
+    [9,0,5, 0,6,1, 4,0,2],
+    [6,2,1, 0,0,0, 0,0,5],
+)
+
 
 @pytest.fixture()
 def group_array_9x1():
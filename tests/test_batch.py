@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from sudoku.batch import BatchException, BatchJob
+from sudoku.puzzle import SudokuPuzzle
+from tests.conftest import puzzle_3x3_hard, puzzle_3x3_simple, solution_3x3_hard, solution_3x3_simple
+
+puzzle_lines = [
+    SudokuPuzzle(puzzle_3x3_simple).to_string(),
+    'not a puzzle',
+    SudokuPuzzle(puzzle_3x3_hard).to_string().replace('0', '.'),
+    '11' + '0' * 79,
+    SudokuPuzzle(puzzle_3x3_simple).to_string(),
+]
+
+
+@pytest.fixture()
+def job(tmp_path):
+    input_path = tmp_path / 'puzzles.txt'
+    input_path.write_text('# corpus\n' + '\n'.join(puzzle_lines) + '\n')
+    return BatchJob(input_path, tmp_path / 'out', chunk_size=2)
+
+
+def test_run_to_completion(job):
+    manifest = job.run()
+    assert manifest['completed_chunks'] == 3
+    assert manifest['solved'] == 3
+    assert manifest['failed'] == 2
+
+    results = list(job.iter_results())
+    assert results[0][1] == SudokuPuzzle(solution_3x3_simple).to_string()
+    assert results[1][1] is None
+    assert results[2][1] == SudokuPuzzle(solution_3x3_hard).to_string()
+
+    failures = [f.split('\t') for f in job.failures_path.read_text().splitlines()]
+    assert [f[0] for f in failures] == ['1', '3']
+    assert failures[1][2] == 'value repeated in a unit'
+
+
+def test_resume_after_interruption(job):
+    manifest = job.run(max_chunks=1)
+    assert manifest['completed_chunks'] == 1
+
+    # simulate a crash part way through the second chunk
+    with open(job.failures_path, 'a') as f:
+        f.write('2\tpartial\tfailure\n')
+
+    manifest = job.run()
+    assert json.loads(job.manifest_path.read_text()) == manifest
+    assert manifest['completed_chunks'] == 3
+    assert len(list(job.iter_results())) == len(puzzle_lines)
+    assert len(job.failures_path.read_text().splitlines()) == 2
+
+
+def test_chunk_size_must_match(job):
+    job.run(max_chunks=1)
+    job.chunk_size = 3
+    with pytest.raises(BatchException):
+        job.run()
+
+
+def test_store_skips_solved_puzzles(job, tmp_path):
+    job.store_path = tmp_path / 'solutions.db'
+    job.run()
+
+    rerun = BatchJob(job.input_path, tmp_path / 'rerun', chunk_size=2, timeout=0, store_path=job.store_path)
+    manifest = rerun.run()
+    assert manifest['solved'] == 3
+    assert list(rerun.iter_results()) == list(job.iter_results())
+
+
+def test_store_with_unparseable_lines(tmp_path):
+    input_path = tmp_path / 'puzzles.txt'
+    input_path.write_text('0000\n' + puzzle_lines[0] + '\n')
+    job = BatchJob(input_path, tmp_path / 'out', chunk_size=2, store_path=tmp_path / 'solutions.db')
+    manifest = job.run()
+    assert manifest['solved'] == 1
+    assert manifest['failed'] == 1
+    assert job.failures_path.read_text().startswith('0\t0000\t')
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+
+from sudoku.encoding import (EncodingException, hash_boards, hash_packed, pack_board, pack_boards,
+                             packed_length, unpack_board, unpack_boards)
+from sudoku.puzzle import SudokuPuzzle
+from tests.conftest import puzzle_3x3_simple, solution_2x2_a, solution_3x3_simple
+
+
+@pytest.mark.parametrize('size, length', [(4, 6), (9, 41), (16, 160), (25, 391)])
+def test_packed_length(size, length):
+    assert packed_length(size) == length
+
+
+@pytest.mark.parametrize('size', [4, 9, 16, 25])
+def test_round_trip_batch(size):
+    boards = np.random.default_rng(size).integers(0, size + 1, (50, size, size))
+    packed = pack_boards(boards)
+    assert packed.shape == (50, packed_length(size))
+    assert np.array_equal(unpack_boards(packed), boards)
+
+
+def test_round_trip_single():
+    data = pack_board(puzzle_3x3_simple)
+    assert len(data) == 41
+    assert np.array_equal(unpack_board(data), puzzle_3x3_simple)
+    assert np.array_equal(unpack_board(pack_board(solution_2x2_a)), solution_2x2_a)
+
+
+def test_puzzle_bytes():
+    puzzle = SudokuPuzzle(puzzle_3x3_simple)
+    assert SudokuPuzzle.from_bytes(puzzle.to_bytes()) == puzzle
+
+
+def test_hash_is_stable():
+    boards = np.array([puzzle_3x3_simple, solution_3x3_simple, puzzle_3x3_simple])
+    hashes = hash_boards(boards)
+    assert hashes.dtype == np.uint64
+    assert hashes[0] == hashes[2] != hashes[1]
+    assert hash_packed(pack_boards(boards[:1]))[0] == 6487475581848771047
+
+
+def test_invalid_size():
+    with pytest.raises(EncodingException):
+        pack_boards(np.zeros((1, 5, 5)))
+    with pytest.raises(EncodingException):
+        unpack_board(b'\x00' * 7)
+
+
+@pytest.mark.parametrize('value', [10, 16, -1])
+def test_value_out_of_range(value):
+    board = np.array(puzzle_3x3_simple)
+    board[0, 0] = value
+    with pytest.raises(EncodingException):
+        pack_board(board)
@@ -0,0 +1,85 @@
+import pickle
+from copy import deepcopy
+
+import numpy as np
+import pytest
+
+from sudoku import SudokuPuzzle, SudokuSolver
+from sudoku.geometry import (GeometryException, classic_geometry, diagonal_geometry, jigsaw_geometry,
+                             make_diagonal_units, make_region_units, make_window_units, windoku_geometry)
+from sudoku.groups import Row, Square, Unit
+from sudoku.puzzle import PuzzleException
+
+rows, cols = np.indices((9, 9))
+jigsaw_regions = rows // 3 * 3 + (cols + rows % 3) % 9 // 3
+
+# each has a unique solution with its variant units and several without them
+variant_puzzles = [
+    (diagonal_geometry(9),
+     '000001000009060700300400080000040237006002000000000040000000500000200300008000000',
+     '825371964149865723367429185591648237436792851782513649213984576974256318658137492'),
+    (windoku_geometry(9),
+     '020000000040000378300000000000100000080000500010003000004000290000005000000030086',
+     '825371964149256378367894152453169827986427531712583649634718295298645713571932486'),
+    (jigsaw_geometry(jigsaw_regions),
+     '000050009000000000000031007000000000400000010830004200008000000000610005004800000',
+     '123456789961372458582931647257149836496287513835794261618523974749618325374865192'),
+]
+
+
+def test_variant_units():
+    assert np.array_equal(make_diagonal_units(4), [[0, 5, 10, 15], [3, 6, 9, 12]])
+    assert np.array_equal(make_window_units(4), [[5, 6, 9, 10]])
+    assert np.array_equal(make_window_units(9)[0], [10, 11, 12, 19, 20, 21, 28, 29, 30])
+    assert diagonal_geometry(9).labels[-2:] == ('diagonal 0', 'diagonal 1')
+    assert windoku_geometry(9).num_units == 31
+    assert classic_geometry(9).is_classic and not diagonal_geometry(9).is_classic
+
+
+def test_copies_keep_cached_geometry():
+    puzzle = SudokuPuzzle(np.zeros((9, 9), dtype=int))
+    for copy in (deepcopy(puzzle), pickle.loads(pickle.dumps(puzzle))):
+        assert copy.geometry is classic_geometry(9) and copy.geometry.is_classic
+    assert pickle.loads(pickle.dumps(windoku_geometry(9))) is windoku_geometry(9)
+
+    jigsaw = pickle.loads(pickle.dumps(jigsaw_geometry(jigsaw_regions)))
+    assert not jigsaw.is_classic
+    assert np.array_equal(jigsaw.units, jigsaw_geometry(jigsaw_regions).units)
+
+
+def test_region_units():
+    geometry = jigsaw_geometry(jigsaw_regions)
+    assert geometry.num_units == 27
+    assert np.array_equal(geometry.units[geometry.unit_index('region 0')], [0, 1, 2, 9, 10, 17, 18, 25, 26])
+    with pytest.raises(GeometryException):
+        make_region_units(np.zeros((9, 9), dtype=int))
+
+
+@pytest.mark.parametrize('geometry, puzzle, solution', variant_puzzles)
+def test_solve_variant(geometry, puzzle, solution):
+    solver = SudokuSolver(SudokuPuzzle.from_string(puzzle, geometry)).solve()
+    assert solver.is_solved
+    assert solver.puzzle.to_string() == solution
+
+
+def test_is_solved_checks_variant_units():
+    solution = SudokuPuzzle.from_string(variant_puzzles[0][2])
+    assert solution.is_solved
+    assert not SudokuPuzzle.from_string(variant_puzzles[1][2], diagonal_geometry(9)).is_solved
+
+
+def test_hidden_values_of_variant_units():
+    geometry, puzzle, solution = variant_puzzles[2]
+    puzzle = SudokuPuzzle.from_string(solution, geometry)
+    puzzle.board[0, 0] = 0
+    unit = puzzle.units[geometry.unit_index('region 0')]
+    assert isinstance(unit, Unit)
+    assert [(c.row, c.col, c.value) for c in puzzle.get_single_hidden_values_of_group(unit)] == [(0, 0, 1)]
+    assert puzzle.get_unit_index(Row(3, puzzle.board[3])) == 3
+    with pytest.raises(PuzzleException):
+        puzzle.get_unit_index(Square(0, puzzle.board[:3, :3]))
+
+
+def test_geometry_size_must_match_board():
+    with pytest.raises(PuzzleException):
+        SudokuPuzzle(np.zeros((4, 4), dtype=int), diagonal_geometry(9))
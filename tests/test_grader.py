@@ -0,0 +1,75 @@
+import numpy as np
+import pytest
+
+from sudoku.grader import SEARCH, SINGLES, TECHNIQUE_WEIGHTS, grade, grade_many
+from sudoku.propagation import Propagator
+from sudoku.search import SearchStats, search, search_batched
+from sudoku.strategies import eliminate_locked_candidates, find_subset
+from tests.conftest import (puzzle_3x3_easy, puzzle_3x3_fish, puzzle_3x3_hard,
+                            puzzle_3x3_simple, solution_3x3_hard)
+
+
+@pytest.mark.parametrize('masks, k, result', [
+    ([0b011, 0b011, 0b111], 2, ((0, 1), 0b011)),
+    ([0b011, 0b011, 0b100], 2, None),
+    ([0b011, 0b110, 0b101, 0b1111], 3, ((0, 1, 2), 0b111)),
+])
+def test_find_subset(masks, k, result):
+    assert find_subset(masks, k) == result
+
+
+def test_locked_candidates_make_progress():
+    propagator = Propagator.from_board(puzzle_3x3_easy).propagate()
+    before = propagator.candidates.sum()
+    assert eliminate_locked_candidates(propagator) is True
+    assert propagator.candidates.sum() < before
+
+
+def test_search_solves_hard_puzzle():
+    stats = SearchStats()
+    solved = search(Propagator.from_board(puzzle_3x3_hard), stats)
+    assert np.array_equal(solved.to_board(), solution_3x3_hard)
+    assert stats.max_depth > 0
+
+
+def test_search_batched_visits_the_same_nodes():
+    propagator = Propagator.from_board(puzzle_3x3_hard).propagate()
+    stats, batched_stats = SearchStats(), SearchStats()
+    search(propagator.copy(), stats)
+    solved = search_batched(propagator.copy(), batched_stats)
+    assert np.array_equal(solved.to_board(), solution_3x3_hard)
+    assert batched_stats == stats
+
+
+@pytest.mark.parametrize('puzzle, hardest', [
+    (puzzle_3x3_simple, SINGLES),
+    (puzzle_3x3_easy, 'locked_candidates'),
+    (puzzle_3x3_fish, 'fish'),
+    (puzzle_3x3_hard, SEARCH),
+])
+def test_grade_hardest_technique(puzzle, hardest):
+    result = grade(puzzle)
+    assert result.solved
+    assert result.hardest == hardest
+    assert result.score >= TECHNIQUE_WEIGHTS[hardest]
+
+
+def test_grade_many_orders_by_difficulty():
+    scores = [g.score for g in grade_many([puzzle_3x3_simple, puzzle_3x3_easy, puzzle_3x3_hard])]
+    assert scores == sorted(scores)
+
+
+def test_grade_many_matches_grade():
+    puzzles = [puzzle_3x3_simple, puzzle_3x3_easy, puzzle_3x3_fish, puzzle_3x3_simple]
+    assert grade_many(puzzles) == [grade(p) for p in puzzles]
+
+
+def test_grade_many_keeps_going_after_bad_puzzles():
+    repeated, out_of_range = np.array(puzzle_3x3_simple), np.array(puzzle_3x3_simple)
+    repeated[0, :2] = 1
+    out_of_range[0, 0] = 10
+    grades = grade_many([puzzle_3x3_simple, repeated, out_of_range, puzzle_3x3_hard])
+    assert [g.solved for g in grades] == [True, False, False, True]
+    assert grades[1].error and grades[2].error
+    assert grades[0] == grade(puzzle_3x3_simple) and grades[3] == grade(puzzle_3x3_hard)
+    assert grade_many([out_of_range])[0].error
@@ -0,0 +1,44 @@
+import subprocess
+import sys
+
+import pytest
+
+import sudoku
+from sudoku.__main__ import main
+from tests.conftest import puzzle_3x3_hard, solution_3x3_hard
+
+
+def to_string(board) -> str:
+    return ''.join(str(v) for row in board for v in row)
+
+
+def test_import_does_not_load_solver():
+    code = 'import sys, sudoku; print(sorted(m for m in ("numpy", "sudoku.solver") if m in sys.modules))'
+    result = subprocess.run([sys.executable, '-c', code], capture_output=True, text=True, check=True)
+    assert result.stdout.strip() == '[]'
+
+
+def test_lazy_attributes():
+    from sudoku.puzzle import SudokuPuzzle
+    assert sudoku.SudokuPuzzle is SudokuPuzzle
+    assert sudoku.grader.grade is not None
+    assert 'SudokuSolver' in dir(sudoku)
+    with pytest.raises(AttributeError):
+        sudoku.missing
+
+
+def test_solve(capsys):
+    assert main(['solve', to_string(puzzle_3x3_hard)]) == 0
+    assert capsys.readouterr().out.strip() == to_string(solution_3x3_hard)
+
+
+def test_solve_invalid_puzzle(capsys):
+    assert main(['solve', '123']) == 1
+    assert 'PuzzleException' in capsys.readouterr().err
+
+
+def test_solve_value_above_size(capsys):
+    assert main(['solve', 'A' + '0' * 80, to_string(puzzle_3x3_hard)]) == 1
+    out, err = capsys.readouterr()
+    assert 'PuzzleException' in err
+    assert out.strip() == to_string(solution_3x3_hard)
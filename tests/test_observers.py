@@ -0,0 +1,83 @@
+import json
+from time import perf_counter
+
+from sudoku.observers import (BRANCH, PLACE, BinaryTraceObserver, ChromeTraceObserver, ObserverGroup,
+                              SolverObserver)
+from sudoku.solver import SudokuSolver
+from tests.conftest import puzzle_3x3_hard, puzzle_3x3_simple
+
+
+class CountingObserver(SolverObserver):
+    def __init__(self):
+        self.counts = {}
+
+    def _count(self, name):
+        self.counts[name] = self.counts.get(name, 0) + 1
+
+    def on_place(self, cell, value, strategy):
+        self._count('place')
+
+    def on_eliminate(self, cell, value):
+        self._count('eliminate')
+
+    def on_branch(self, cell, value, depth):
+        self._count('branch')
+
+    def on_backtrack(self, depth):
+        self._count('backtrack')
+
+    def on_solution(self, depth):
+        self._count('solution')
+
+    def on_iteration(self, unit, num_queued):
+        self._count('iteration')
+
+
+def test_observer_sees_propagation():
+    observer = CountingObserver()
+    solver = SudokuSolver(puzzle_3x3_simple, observer=observer)
+    num_empty_cells = solver.num_empty_cells
+    solver.solve()
+    assert observer.counts['place'] == num_empty_cells
+    assert observer.counts['eliminate'] > 0
+    assert observer.counts['iteration'] > 0
+    assert 'branch' not in observer.counts
+
+
+def test_observer_sees_search():
+    observer = CountingObserver()
+    SudokuSolver(puzzle_3x3_hard, observer=observer).solve()
+    assert observer.counts['backtrack'] > 0
+    assert observer.counts['branch'] == observer.counts['backtrack'] + observer.counts['solution']
+
+
+def test_binary_trace():
+    observer = BinaryTraceObserver()
+    SudokuSolver(puzzle_3x3_hard, observer=observer).solve()
+    records = list(BinaryTraceObserver.iter_records(observer.to_bytes()))
+    assert len(records) == len(observer)
+    assert {r.event for r in records} >= {PLACE, BRANCH}
+    assert all(0 <= r.cell < 81 for r in records)
+    assert [r.time_us for r in records] == sorted(r.time_us for r in records)
+
+
+def test_chrome_trace_with_group(tmp_path):
+    chrome = ChromeTraceObserver()
+    binary = BinaryTraceObserver()
+    SudokuSolver(puzzle_3x3_hard, observer=ObserverGroup([chrome, binary])).solve()
+    chrome.write(tmp_path / 'trace.json')
+
+    events = json.loads((tmp_path / 'trace.json').read_text())['traceEvents']
+    assert len(binary) > 0
+    assert {e['ph'] for e in events} >= {'i', 'B', 'E', 'C'}
+    assert any(e['name'] == 'search' for e in events)
+    phases = [e['ph'] for e in events]
+    assert phases.count('B') == phases.count('E')
+
+
+def test_binary_trace_time_beyond_32_bits():
+    observer = BinaryTraceObserver(start=perf_counter() - 2 ** 32 / 1e6)
+    observer.on_solution(3)
+    record, = BinaryTraceObserver.iter_records(observer.to_bytes())
+    assert record.name == 'solution'
+    assert record.time_us >= 2 ** 32
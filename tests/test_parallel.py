@@ -0,0 +1,99 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from sudoku.geometry import classic_geometry
+from sudoku.parallel import (ThreadPoolSolver, count_solutions_parallel, get_thread_scratch, solve_board,
+                             solve_parallel, split)
+from sudoku.propagation import Propagator
+from sudoku.search import SearchLimitException, SearchScratch, count_solutions, search_in_scratch
+from tests.conftest import (puzzle_3x3_easy, puzzle_3x3_hard, puzzle_3x3_simple, solution_2x2_a,
+                            solution_3x3_easy, solution_3x3_hard, solution_3x3_simple)
+
+
+def test_split_covers_search_tree():
+    propagator = Propagator.from_board(puzzle_3x3_hard).propagate()
+    subproblems = split(propagator, 8)
+    assert len(subproblems) >= 8
+    assert all(p.num_empty_cells < propagator.num_empty_cells for p in subproblems)
+
+
+def test_solve_parallel():
+    assert np.array_equal(solve_parallel(puzzle_3x3_hard, processes=2), solution_3x3_hard)
+
+
+def test_solve_parallel_without_solution():
+    board = np.array(solution_2x2_a)
+    board[0, 0] = 2
+    board[0, 1] = 0
+    assert solve_parallel(board, processes=2) is None
+
+
+def test_count_solutions_parallel():
+    board = np.array(solution_2x2_a)
+    board[:2] = 0
+    expected = count_solutions(Propagator.from_board(board).propagate())
+    assert expected > 1
+    assert count_solutions_parallel(board, processes=2) == expected
+    assert count_solutions_parallel(puzzle_3x3_hard, processes=2) == 1
+
+
+def test_search_in_scratch_matches_search():
+    propagator = Propagator.from_board(puzzle_3x3_hard).propagate()
+    scratch = SearchScratch.for_geometry(propagator.geometry)
+    solved = search_in_scratch(propagator, scratch)
+    assert np.array_equal(solved.to_board(), solution_3x3_hard)
+    assert np.shares_memory(solved.board, scratch.boards)
+
+
+def test_thread_scratch_is_per_thread():
+    geometry = classic_geometry(9)
+    scratch = get_thread_scratch(geometry)
+    assert get_thread_scratch(geometry) is scratch
+    with ThreadPoolExecutor(1) as executor:
+        assert executor.submit(get_thread_scratch, geometry).result() is not scratch
+
+
+def test_thread_pool_solver():
+    puzzles = [puzzle_3x3_hard, puzzle_3x3_simple, puzzle_3x3_easy] * 4
+    solutions = [solution_3x3_hard, solution_3x3_simple, solution_3x3_easy] * 4
+    board = np.array(puzzle_3x3_hard)
+    with ThreadPoolSolver(max_workers=4) as solver:
+        results = solver.solve_many(puzzles + [board])
+    assert all(np.array_equal(r, s) for r, s in zip(results, solutions + [solution_3x3_hard]))
+    assert np.array_equal(board, puzzle_3x3_hard)
+
+
+def test_solve_board_without_solution():
+    board = np.zeros((4, 4), dtype=int)
+    board[0, 1:3] = 2, 3
+    board[1, 1] = 4
+    board[2, 0] = 1
+    assert solve_board(board) is None
+
+
+def test_thread_pool_solver_limits():
+    with ThreadPoolSolver(max_workers=1, node_limit=1) as solver:
+        with pytest.raises(SearchLimitException):
+            solver.solve(puzzle_3x3_hard)
+    with ThreadPoolSolver(max_workers=1, timeout=0) as solver:
+        with pytest.raises(SearchLimitException):
+            solver.solve(puzzle_3x3_hard)
+
+
+def test_search_in_scratch_deadline():
+    propagator = Propagator.from_board(puzzle_3x3_hard).propagate()
+    scratch = SearchScratch.for_geometry(propagator.geometry)
+    with pytest.raises(SearchLimitException):
+        search_in_scratch(propagator, scratch, deadline=0)
+
+
+def test_load_board_uses_scratch_buffers():
+    scratch = SearchScratch.for_geometry(classic_geometry(9))
+    propagator = scratch.load_board(np.array(puzzle_3x3_hard), classic_geometry(9))
+    expected = Propagator.from_board(puzzle_3x3_hard)
+    assert np.shares_memory(propagator.board, scratch.boards)
+    assert np.shares_memory(propagator.candidates, scratch.candidates)
+    assert np.array_equal(propagator.candidates, expected.candidates)
+    assert list(propagator.queue) == list(expected.queue)
@@ -0,0 +1,51 @@
+import argparse
+
+import pytest
+
+import performance
+from performance import (MemoryReport, check_budgets, measure_import_time, measure_memory, parse_budget,
+                         parse_import_budget, profile_imports)
+
+
+def test_measure_memory():
+    report = measure_memory('list', lambda: list(range(100_000)))
+    assert report.name == 'list'
+    assert report.peak_bytes > 100_000 * 8
+    assert report.retained_bytes < 100_000
+
+    kept = []
+    report = measure_memory('leak', lambda: kept.append(list(range(100_000))), warmup=False)
+    assert report.retained_bytes > 100_000 * 8
+
+
+def test_check_budgets():
+    reports = [MemoryReport('grade', 2000, 1, 100), MemoryReport('propagate', 500, 1, 100)]
+    messages = check_budgets(reports, {'grade': 1000, 'propagate': 1000, 'solve_hard': 1})
+    assert len(messages) == 1
+    assert messages[0].startswith('grade: peak 2000 bytes')
+    assert check_budgets(reports, {}) == []
+
+
+def test_parse_budget():
+    assert parse_budget('grade=1024') == ('grade', 1024)
+    for text in ('grade', 'grade=1k', 'missing=10'):
+        with pytest.raises(argparse.ArgumentTypeError):
+            parse_budget(text)
+
+
+def test_parse_import_budget():
+    assert parse_import_budget('sudoku=2.5') == ('sudoku', 2.5)
+    with pytest.raises(argparse.ArgumentTypeError):
+        parse_import_budget('sudoku')
+
+
+def test_measure_import_time():
+    assert measure_import_time('sudoku', repeat=1) > 0
+
+
+def test_profile_imports_over_budget(monkeypatch, capsys):
+    monkeypatch.setattr(performance, 'IMPORT_MODULES', ('sudoku',))
+    monkeypatch.setattr(performance, 'measure_import_time', lambda module: {'sudoku': 3.0, 'sudoku.solver': 50.0}[module])
+    assert profile_imports({'sudoku': 5}) == 0
+    assert profile_imports({'sudoku.solver': 20}) == 1
+    assert 'over budget: sudoku.solver' in capsys.readouterr().err
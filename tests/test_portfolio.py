@@ -0,0 +1,48 @@
+import numpy as np
+import pytest
+
+from sudoku.exact_cover import solve_exact_cover
+from sudoku.portfolio import CONFIGURATIONS, PortfolioSolver
+from sudoku.propagation import Propagator
+from sudoku.search import luby, search_with_restarts
+from tests.conftest import puzzle_3x3_hard, solution_3x3_hard
+
+
+def test_luby():
+    assert [luby(i) for i in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+
+def test_search_with_restarts():
+    solved = search_with_restarts(Propagator.from_board(puzzle_3x3_hard), seed=0, base_nodes=4)
+    assert np.array_equal(solved.to_board(), solution_3x3_hard)
+
+
+def test_exact_cover():
+    assert np.array_equal(solve_exact_cover(Propagator.from_board(puzzle_3x3_hard)), solution_3x3_hard)
+
+
+def test_exact_cover_without_solution():
+    board = np.zeros((4, 4), dtype=int)
+    board[0, 1:3] = 2, 3
+    board[1, 1] = 4
+    board[2, 0] = 1
+    assert solve_exact_cover(Propagator.from_board(board)) is None
+
+
+@pytest.mark.parametrize('name', list(CONFIGURATIONS))
+def test_configurations_solve_hard_puzzle_or_give_up(name):
+    solved = CONFIGURATIONS[name](Propagator.from_board(puzzle_3x3_hard).propagate())
+    assert solved is None or np.array_equal(solved, solution_3x3_hard)
+
+
+def test_portfolio_records_winner():
+    solver = PortfolioSolver(timeout=30)
+    result = solver.solve(puzzle_3x3_hard)
+    assert np.array_equal(result.board, solution_3x3_hard)
+    assert result.winner in CONFIGURATIONS
+    assert solver.wins[result.winner] == 1
+
+
+def test_portfolio_rejects_unknown_configuration():
+    with pytest.raises(ValueError):
+        PortfolioSolver(configurations=('guessing',))
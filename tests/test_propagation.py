@@ -0,0 +1,82 @@
+import numpy as np
+import pytest
+
+from sudoku.geometry import classic_geometry
+from sudoku.grader import grade
+from sudoku.propagation import ContradictionException, Propagator, fill_singles_batch, make_candidates
+from sudoku.puzzle import PuzzleException
+from sudoku.session import HintSession
+from sudoku.solver import SudokuSolver
+from tests.conftest import puzzle_3x3_simple, solution_2x2_a, solution_3x3_simple
+
+
+def test_classic_geometry_units():
+    geometry = classic_geometry(9)
+    assert geometry.num_units == 27
+    assert np.array_equal(geometry.units[0], np.arange(9))
+    assert np.array_equal(geometry.units[9], np.arange(0, 81, 9))
+    assert np.array_equal(geometry.units[18], [0, 1, 2, 9, 10, 11, 18, 19, 20])
+    assert all(len(p) == 20 for p in geometry.peers)
+    assert all(len(u) == 3 for u in geometry.cell_units)
+
+
+def test_make_candidates():
+    board = np.array(solution_2x2_a).ravel()
+    board[0] = 0
+    candidates = make_candidates(board, classic_geometry(4))
+    assert list(candidates[0]) == [True, False, False, False]
+    assert not candidates[1:].any()
+
+
+def test_propagate_solves_simple_puzzle():
+    propagator = Propagator.from_board(puzzle_3x3_simple).propagate()
+    assert propagator.is_solved
+    assert np.array_equal(propagator.to_board(), solution_3x3_simple)
+    assert len(propagator.queue) == 0
+
+
+def test_place_only_queues_affected_units():
+    propagator = Propagator.from_board(np.zeros((9, 9), dtype=int))
+    propagator.queue.clear()
+    propagator.queued[:] = False
+
+    propagator.place(0, 1)
+
+    assert not propagator.candidates[propagator.geometry.peers[0], 0].any()
+    assert set(propagator.queue) == set(np.flatnonzero(propagator.geometry.membership[propagator.geometry.peers[0]].any(0)))
+
+
+def test_contradiction_raised():
+    board = np.array(solution_2x2_a)
+    board[0, :2] = 0
+    propagator = Propagator.from_board(board)
+    with pytest.raises(ContradictionException):
+        propagator.place(0, 2)
+
+
+def test_fill_singles_matches_propagate():
+    propagator = Propagator.from_board(puzzle_3x3_simple)
+    assert propagator.fill_singles() == np.count_nonzero(np.ravel(puzzle_3x3_simple) == 0)
+    assert np.array_equal(propagator.to_board(), solution_3x3_simple)
+    assert len(propagator.queue) == 0
+
+
+def test_fill_singles_batch():
+    geometry = classic_geometry(9)
+    boards = np.stack([np.ravel(puzzle_3x3_simple), np.ravel(solution_3x3_simple)])
+    boards[1, 0] = 0
+    candidates = make_candidates(boards, geometry)
+    candidates[1, 0] = False
+    filled, failed = fill_singles_batch(boards, candidates, geometry)
+    assert filled[0] == np.count_nonzero(np.ravel(puzzle_3x3_simple) == 0)
+    assert list(failed) == [False, True]
+    assert np.array_equal(boards[0], np.ravel(solution_3x3_simple))
+
+
+@pytest.mark.parametrize('value', [10, -1])
+def test_values_out_of_range_rejected(value):
+    board = np.array(puzzle_3x3_simple)
+    board[0, 0] = value
+    for make in (Propagator.from_board, lambda b: SudokuSolver(b).solve(), grade, HintSession.from_puzzle):
+        with pytest.raises(PuzzleException):
+            make(board)
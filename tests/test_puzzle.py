@@ -1,10 +1,10 @@
 import numpy as np
 import pytest
 
-from sudoku.puzzle import SudokuPuzzle, Cell
+from sudoku.puzzle import PuzzleException, SudokuPuzzle, Cell
 from sudoku.groups import ColArray, RowArray, SquareArray, Col, Row, Square
 from sudoku.validators.array_validators import is_nd_array, is_square_array
-from tests.conftest import solution_2x2_a, solution_3x3_a
+from tests.conftest import puzzle_3x3_simple, solution_2x2_a, solution_3x3_a, solution_3x3_simple
 
 
 @pytest.mark.parametrize('puzzle_in', [
@@ -61,3 +61,62 @@ class TestPuzzleGroups:
         square_returned = puzzle_in.get_square_from_cell(cell)
 
         assert square_returned == square_correct
+
+
+def test_get_single_hidden_values():
+    puzzle = SudokuPuzzle(puzzle_3x3_simple)
+    cells = puzzle.get_single_hidden_values()
+    assert (0, 3, 1) in [(c.row, c.col, c.value) for c in cells]
+    for cell in cells:
+        assert solution_3x3_simple[cell.row][cell.col] == cell.value
+
+
+def test_get_single_hidden_values_of_group_matches_board_wide():
+    puzzle = SudokuPuzzle(puzzle_3x3_simple)
+    board_wide = [(c.row, c.col, c.value) for c in puzzle.get_single_hidden_values()]
+    for group in puzzle.rows + puzzle.cols + puzzle.squares:
+        for cell in puzzle.get_single_hidden_values_of_group(group):
+            assert (cell.row, cell.col, cell.value) in board_wide
+
+
+def test_string_round_trip():
+    puzzle = SudokuPuzzle(puzzle_3x3_simple)
+    text = puzzle.to_string()
+    assert len(text) == 81
+    assert SudokuPuzzle.from_string(text) == puzzle
+    assert SudokuPuzzle.from_string(text.replace('0', '.')) == puzzle
+
+
+def test_string_with_letters():
+    text = '123456789ABCDEFG' * 16
+    assert SudokuPuzzle.from_string(text).board[0, -1] == 16
+    assert SudokuPuzzle.from_string(text).to_string() == text
+
+
+@pytest.mark.parametrize('text', ['123', '12?4' * 4, '1235' * 4])
+def test_invalid_string(text):
+    with pytest.raises(PuzzleException):
+        SudokuPuzzle.from_string(text)
+
+
+def test_index_arrays_match_cells():
+    puzzle = SudokuPuzzle(puzzle_3x3_simple)
+    for group, get_cells, get_indices in [
+        (puzzle.rows[2], puzzle.get_cells_from_row, puzzle.get_indices_from_row),
+        (puzzle.cols[4], puzzle.get_cells_from_col, puzzle.get_indices_from_col),
+        (puzzle.squares[5], puzzle.get_cells_from_square, puzzle.get_indices_from_square),
+    ]:
+        indices, values = get_indices(group)
+        assert list(indices) == [c.row * 9 + c.col for c in get_cells(group)]
+        assert list(values) == list(np.ravel(group.array))
+
+
+def test_empty_cell_indices_and_put_cells():
+    puzzle = SudokuPuzzle(puzzle_3x3_simple)
+    empty = puzzle.get_empty_cell_indices()
+    assert list(empty) == [r * 9 + c for r, c in puzzle.get_empty_cell_coords()]
+
+    solution = np.array(solution_3x3_simple).ravel()
+    puzzle.put_cells(empty, solution[empty])
+    assert puzzle.is_solved
+    assert np.array_equal(puzzle.get_cells(empty), solution[empty])
@@ -0,0 +1,83 @@
+import numpy as np
+import pytest
+
+from sudoku.propagation import ContradictionException, Propagator
+from sudoku.session import HintSession
+from tests.conftest import (puzzle_3x3_easy, puzzle_3x3_fish, puzzle_3x3_hard, puzzle_3x3_simple,
+                            solution_3x3_easy, solution_3x3_simple)
+
+
+@pytest.mark.parametrize('puzzle, solution', [
+    (puzzle_3x3_simple, solution_3x3_simple),
+    (puzzle_3x3_easy, solution_3x3_easy),
+])
+def test_hints_solve_puzzle(puzzle, solution):
+    session = HintSession.from_puzzle(puzzle)
+    while (hint := session.apply_hint()) is not None:
+        assert solution[hint.row][hint.col] == hint.value
+    assert np.array_equal(session.board, solution)
+
+
+def test_hint_is_stable_until_edit():
+    session = HintSession.from_puzzle(puzzle_3x3_simple)
+    hint = session.next_hint()
+    assert session.next_hint() is hint
+    assert hint.technique in ('naked_single', 'hidden_single', 'group_with_one_missing')
+    assert all(hint.row * 9 + hint.col in session.propagator.geometry.units[u] for u in hint.units)
+    assert session.unit_labels(hint)[0].split()[0] in ('row', 'col', 'square')
+
+
+def test_hint_from_advanced_technique():
+    session = HintSession.from_puzzle(puzzle_3x3_fish)
+    hint = session.next_hint()
+    assert hint.technique == 'fish'
+    assert session.propagator.candidates.sum() == Propagator.from_board(puzzle_3x3_fish).candidates.sum()
+
+
+def test_no_hint_when_stuck():
+    assert HintSession.from_puzzle(puzzle_3x3_hard).next_hint() is None
+
+
+def test_edits_are_incremental():
+    session = HintSession.from_puzzle(puzzle_3x3_simple)
+    session.next_hint()
+    original = session.propagator.candidates.copy()
+
+    session.set_cell(0, 0, 4)
+    assert session.hint is None
+    assert not session.propagator.candidates[1, 3]
+
+    session.set_cell(0, 0, 0)
+    assert np.array_equal(session.propagator.candidates, original)
+
+
+def test_conflicting_edit():
+    session = HintSession.from_puzzle(puzzle_3x3_simple)
+    with pytest.raises(ContradictionException):
+        session.set_cell(0, 0, 3)
+
+
+def test_conflicting_edit_keeps_previous_value():
+    session = HintSession.from_puzzle(puzzle_3x3_simple)
+    session.set_cell(0, 0, 4)
+    candidates = session.propagator.candidates.copy()
+    with pytest.raises(ContradictionException):
+        session.set_cell(0, 0, 3)
+    assert session.board[0, 0] == 4
+    assert np.array_equal(session.propagator.candidates, candidates)
+
+
+def test_wrong_edit_reports_contradiction():
+    session = HintSession.from_puzzle(puzzle_3x3_simple)
+    cell = int(np.flatnonzero(session.propagator.board == 0)[0])
+    row, col = divmod(cell, 9)
+    wrong = next(v + 1 for v in np.flatnonzero(session.propagator.candidates[cell])
+                 if v + 1 != solution_3x3_simple[row][col])
+    session.set_cell(row, col, wrong)
+    while session.apply_hint() is not None:
+        pass
+    assert session.contradiction is not None
+    assert session.next_hint() is None
+
+    session.set_cell(row, col, 0)
+    assert session.contradiction is None
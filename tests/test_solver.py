@@ -4,12 +4,14 @@ from itertools import chain, permutations
 import numpy as np
 import pytest
 
-from sudoku.puzzle import make_line, make_square, SudokuPuzzle
+from sudoku.puzzle import make_line, make_square, PuzzleException, SudokuPuzzle
 from sudoku.solver import check_and_fill_group_with_one_missing, SudokuSolver
 from sudoku.validators import is_square_array
 from tests.conftest import (solution_2x2_a, solution_3x3_a,
                             solution_3x3_simple, puzzle_3x3_simple,
-                            solution_3x3_easy, puzzle_3x3_easy)
+                            solution_3x3_easy, puzzle_3x3_easy,
+                            solution_3x3_hard, puzzle_3x3_hard,
+                            puzzle_3x3_fish)
 from sudoku.groups import Group
 
 
@@ -150,3 +152,61 @@ def test_solve_easy(puzzle, solution):
 
     assert solver.is_solved
     assert np.array_equal(solver.puzzle.board, solution.board)
+
+
+def test_solve_hard_with_search():
+    solver = SudokuSolver(puzzle_3x3_hard)
+
+    solver.solve()
+
+    assert solver.is_solved
+    assert np.array_equal(solver.puzzle.board, solution_3x3_hard)
+
+
+def test_solve_hard_without_search():
+    solver = SudokuSolver(puzzle_3x3_hard, use_search=False)
+
+    solver.solve()
+
+    assert solver.is_solved is False
+
+
+def test_solve_rejects_repeated_values():
+    puzzle = np.zeros((4, 4), dtype=int)
+    puzzle[0, :2] = 1
+    with pytest.raises(PuzzleException):
+        SudokuSolver(puzzle).solve()
+
+
+def test_solve_iter_streams_progress():
+    solver = SudokuSolver(puzzle_3x3_hard)
+    num_empty_cells = solver.num_empty_cells
+
+    events = list(solver.solve_iter())
+
+    assert solver.is_solved
+    assert len(events) == num_empty_cells
+    assert [e.num_empty_cells for e in events] == list(range(num_empty_cells - 1, -1, -1))
+    assert events[-1].strategy == 'search'
+    for event in events:
+        assert solution_3x3_hard[event.row][event.col] == event.value
+
+
+def test_solve_iter_stopped_early_keeps_partial_board():
+    solver = SudokuSolver(puzzle_3x3_simple)
+    num_empty_cells = solver.num_empty_cells
+
+    for i, event in enumerate(solver.solve_iter()):
+        if i == 4:
+            break
+
+    assert solver.num_empty_cells == num_empty_cells - 5 == event.num_empty_cells
+    assert solver.puzzle.board[event.row, event.col] == event.value
+
+
+def test_solve_with_templates():
+    solver = SudokuSolver(puzzle_3x3_fish)
+    num_empty_cells = solver.num_empty_cells
+    solver.solve_with_templates()
+    assert solver.num_empty_cells < num_empty_cells
+    assert SudokuSolver(solver.puzzle).solve().is_solved
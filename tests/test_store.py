@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from sudoku.puzzle import SudokuPuzzle
+from sudoku.solver import SudokuSolver
+from sudoku.store import SolutionStore, board_key
+from tests.conftest import (puzzle_3x3_easy, puzzle_3x3_hard, puzzle_3x3_simple,
+                            solution_3x3_easy, solution_3x3_hard, solution_3x3_simple)
+
+
+@pytest.fixture()
+def store(tmp_path):
+    with SolutionStore(tmp_path / 'solutions.db') as store:
+        yield store
+
+
+def test_board_key():
+    assert len(board_key(puzzle_3x3_simple)) == 16
+    assert board_key(puzzle_3x3_simple) == board_key(SudokuPuzzle(puzzle_3x3_simple))
+    assert board_key(puzzle_3x3_simple) != board_key(puzzle_3x3_easy)
+
+
+def test_get_and_put(store):
+    assert store.get(puzzle_3x3_simple) is None
+    store.put(puzzle_3x3_simple, solution_3x3_simple)
+    assert np.array_equal(store.get(puzzle_3x3_simple), solution_3x3_simple)
+    assert puzzle_3x3_simple in store
+
+
+def test_bulk_get_and_put(store):
+    store.put_many([(puzzle_3x3_simple, solution_3x3_simple), (puzzle_3x3_hard, solution_3x3_hard)])
+    found = store.get_many([puzzle_3x3_hard, puzzle_3x3_easy, puzzle_3x3_simple])
+    assert np.array_equal(found[0], solution_3x3_hard)
+    assert found[1] is None
+    assert np.array_equal(found[2], solution_3x3_simple)
+
+
+def test_concurrent_reader(store, tmp_path):
+    store.put(puzzle_3x3_simple, solution_3x3_simple)
+    with SolutionStore(tmp_path / 'solutions.db') as reader:
+        assert np.array_equal(reader.get(puzzle_3x3_simple), solution_3x3_simple)
+
+
+def test_prune_removes_oldest(store):
+    rng = np.random.default_rng(0)
+    boards = [rng.integers(0, 10, (9, 9)) for _ in range(2000)]
+    store.put_many((b, b) for b in boards)
+    size = store.size_bytes
+
+    removed = store.prune(size // 2)
+
+    assert removed > 0
+    assert store.size_bytes <= size // 2
+    assert store.get(boards[0]) is None
+    assert store.get(boards[-1]) is not None
+
+
+def test_solver_uses_store(store):
+    SudokuSolver(puzzle_3x3_easy, store=store).solve()
+    assert np.array_equal(store.get(puzzle_3x3_easy), solution_3x3_easy)
+
+    store.put(puzzle_3x3_hard, solution_3x3_hard)
+    solver = SudokuSolver(puzzle_3x3_hard, store=store, use_search=False).solve()
+    assert solver.is_solved
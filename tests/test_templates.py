@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+
+from sudoku.geometry import classic_geometry, diagonal_geometry, jigsaw_geometry, windoku_geometry
+from sudoku.propagation import ContradictionException, Propagator
+from sudoku.search import search
+from sudoku.strategies import eliminate_locked_candidates
+from sudoku.templates import eliminate_templates, filter_templates, make_templates
+from tests.conftest import puzzle_3x3_fish, solution_2x2_a
+
+
+def test_templates_fill_every_unit_once():
+    geometry = classic_geometry(9)
+    templates = make_templates(geometry)
+    assert len(templates) == 46656
+    assert (geometry.membership[templates.cells].sum(axis=1) == 1).all()
+    assert len(np.unique(templates.cells, axis=0)) == len(templates)
+    assert templates.cells.nbytes + templates.bits.nbytes < 2 ** 21
+    assert make_templates(geometry) is templates
+    assert len(make_templates(diagonal_geometry(9))) < len(templates)
+
+
+@pytest.mark.parametrize('geometry', [diagonal_geometry(9), windoku_geometry(9)])
+def test_variant_templates_cover_every_unit_once(geometry):
+    templates = make_templates(geometry)
+    assert 0 < len(templates) < 46656
+    assert (geometry.membership[templates.cells].sum(axis=1) == 1).all()
+
+
+def test_templates_cached_by_geometry_kind_and_units():
+    templates = make_templates(classic_geometry(9))
+    regions = np.arange(81).reshape(9, 9) % 9
+    jigsaw = make_templates(jigsaw_geometry(regions))
+    for geometry in (diagonal_geometry(9), windoku_geometry(9), jigsaw_geometry(regions.T)):
+        make_templates(geometry)
+    assert make_templates(classic_geometry(9)) is templates
+    assert make_templates(jigsaw_geometry(regions)) is jigsaw
+
+
+def test_filter_templates_keeps_givens():
+    board = np.array(solution_2x2_a).ravel()
+    propagator = Propagator.from_board(np.array(solution_2x2_a))
+    templates = make_templates(propagator.geometry)
+    survivors = filter_templates(templates, board, propagator.candidates)
+    assert (survivors.sum(axis=0) == 1).all()
+    for value in range(4):
+        assert np.array_equal(board[templates.cells[survivors[:, value]][0]], np.full(4, value + 1))
+
+
+def test_filter_templates_matches_cells():
+    propagator = Propagator.from_board(puzzle_3x3_fish).propagate()
+    templates = make_templates(propagator.geometry)
+    allowed = propagator.candidates | (np.arange(1, 10) == propagator.board[:, None])
+    expected = allowed[templates.cells].all(axis=1)
+    assert np.array_equal(filter_templates(templates, propagator.board, propagator.candidates), expected)
+
+
+def test_templates_find_eliminations_after_locked_candidates():
+    propagator = Propagator.from_board(puzzle_3x3_fish).propagate()
+    while eliminate_locked_candidates(propagator):
+        propagator.propagate()
+    solution = search(propagator.copy()).board
+    num_candidates = propagator.candidates.sum()
+
+    assert eliminate_templates(propagator) is True
+    assert propagator.candidates.sum() < num_candidates
+    empty = propagator.board == 0
+    assert propagator.candidates[np.flatnonzero(empty), solution[empty] - 1].all()
+    assert np.array_equal(propagator.board[~empty], solution[~empty])
+
+
+def test_templates_without_placements_raise():
+    propagator = Propagator.from_board(np.zeros((4, 4), dtype=int))
+    propagator.candidates[:, 0] = False
+    with pytest.raises(ContradictionException):
+        eliminate_templates(propagator)
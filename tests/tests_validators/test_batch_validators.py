@@ -0,0 +1,49 @@
+import numpy as np
+import pytest
+
+import sudoku.validators.batch_validators as validators
+from tests.conftest import puzzle_3x3_simple, solution_2x2_a, solution_3x3_a, solution_3x3_simple
+
+
+@pytest.fixture()
+def boards():
+    repeated_in_square = np.array(puzzle_3x3_simple)
+    repeated_in_square[1, 1] = 3
+    out_of_range = np.array(puzzle_3x3_simple)
+    out_of_range[0, 0] = 10
+    return np.array([puzzle_3x3_simple, solution_3x3_simple, repeated_in_square, out_of_range, solution_3x3_a])
+
+
+def test_unit_values_batch():
+    unit_values = validators.get_unit_values_batch(np.array([solution_2x2_a]))
+    assert unit_values.shape == (1, 12, 4)
+    assert list(unit_values[0, 4]) == [1, 3, 2, 4]
+    assert list(unit_values[0, 8]) == [1, 2, 3, 4]
+
+
+def test_unit_conflicts(boards):
+    conflicts = validators.has_unit_conflicts_batch(boards)
+    assert conflicts.shape == (5, 27)
+    assert not conflicts[[0, 1, 4]].any()
+    assert list(np.flatnonzero(conflicts[2])) == [18]
+
+
+def test_validate_boards(boards):
+    validation = validators.validate_boards(boards)
+    assert list(validation.valid_shape) == [True] * 5
+    assert list(validation.valid_values) == [True, True, True, False, True]
+    assert list(validation.complete) == [False, True, False, False, True]
+    assert list(validation.valid) == [True, True, False, False, True]
+
+
+def test_validate_boards_of_mixed_shapes():
+    validation = validators.validate_boards([solution_2x2_a, np.zeros((5, 5)), solution_3x3_a, np.zeros(9)])
+    assert list(validation.valid_shape) == [True, False, True, False]
+    assert list(validation.complete) == [True, False, True, False]
+    assert validation.unit_conflicts.shape == (4, 27)
+
+
+def test_validate_single_board():
+    validation = validators.validate_boards(np.array(solution_3x3_simple))
+    assert list(validation.valid) == [True]
+    assert list(validation.complete) == [True]